@@ -0,0 +1,126 @@
+import asyncio
+import json
+import typing as t
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.base.dependencies.streaming import NDJSON_MEDIA_TYPE
+
+
+READ_METHODS: t.Final[frozenset[str]] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ConcurrencyLimiter:
+    """A concurrency limit with a bounded queue of requests waiting for a slot."""
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float) -> None:
+        self._semaphore = asyncio.Semaphore(limit)
+        self._queue_size = queue_size
+        self._queue_timeout = queue_timeout
+        self._waiting = 0
+
+    async def acquire(self) -> bool:
+        # a free slot goes to the longest waiting request, the queue is first in, first out
+        if not self._waiting and not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return True
+        if self._waiting >= self._queue_size:
+            return False
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self._queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiting -= 1
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+
+def route_class_by_method(scope: Scope) -> str:
+    return "read" if scope["method"] in READ_METHODS else "write"
+
+
+class AdmissionControlMiddleware:
+    """
+    Rejects requests with `503` and `Retry-After` once their route class has its limit of
+    requests in flight and `queue_size` more waiting, or when a queued request waited
+    `queue_timeout` seconds, instead of letting them queue on the connection pool.
+    `classify` names the route class of a request, one of `limits`; requests it returns
+    `None` for are not limited.
+
+    The slot is freed as soon as the response starts, since `UnitOfWorkRoute` has already
+    returned the connection by then; streamed responses keep it until they are exhausted.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: t.Mapping[str, int],
+        queue_size: int,
+        queue_timeout: float,
+        retry_after: int,
+        classify: t.Callable[[Scope], t.Optional[str]] = route_class_by_method,
+        exempt_paths: t.Collection[str] = (),
+    ) -> None:
+        self.app = app
+        self.limiters = {
+            name: ConcurrencyLimiter(limit, queue_size, queue_timeout)
+            for name, limit in limits.items()
+        }
+        self.classify = classify
+        self.retry_after = retry_after
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters.get(self.classify(scope))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        if not await limiter.acquire():
+            await self._reject(send)
+            return
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                limiter.release()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", ()))
+                if not headers.get(b"content-type", b"").startswith(NDJSON_MEDIA_TYPE.encode()):
+                    release()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            release()
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps(
+            {"status": 503, "message": "Service is overloaded, please retry later."}
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(self.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
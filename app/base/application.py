@@ -1,14 +1,19 @@
 from fastapi import APIRouter, FastAPI
+from .admission import AdmissionControlMiddleware
+from .dependencies.db import route_workload
+from .responses import FastJSONResponse
 from .settings import settings
 import logging
 import httpx
 
+from app.db.session import pool_settings
 from app.modules.healthcheck.view import router as healthcheck_router
 from app.modules.customers.view import router as customers_router
 from app.modules.shipments.view import router as shipments_router
 from app.modules.orders.view import router as orders_router
 from app.modules.laptops.view import router as laptop_router
 from app.modules.components.view import router as components_router
+from app.modules.metrics.view import router as metrics_router
 
 
 logger = logging.getLogger(__name__)
@@ -22,6 +27,7 @@ def setup_routing(app_instance: FastAPI):
     global_router.include_router(orders_router, tags=["orders"])
     global_router.include_router(laptop_router, tags=["laptops"])
     global_router.include_router(components_router, tags=["components"])
+    global_router.include_router(metrics_router, tags=["metrics"])
 
     app_instance.include_router(global_router)
 
@@ -39,14 +45,34 @@ def setup_httpx_client(app_instance: FastAPI) -> FastAPI:
     return app_instance
 
 
+def setup_admission_control(app_instance: FastAPI) -> FastAPI:
+    app_instance.add_middleware(
+        AdmissionControlMiddleware,
+        # as many requests in flight per workload as its pool has connections
+        limits={
+            workload.value: workload_pool_settings.size + workload_pool_settings.max_overflow
+            for workload, workload_pool_settings in pool_settings.items()
+        },
+        classify=route_workload,
+        queue_size=settings.ADMISSION_QUEUE_SIZE,
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT.total_seconds(),
+        retry_after=int(settings.ADMISSION_RETRY_AFTER.total_seconds()),
+        # the load balancer and the scraper must still get through when saturated
+        exempt_paths={"/api/healthcheck", "/api/metrics"},
+    )
+    return app_instance
+
+
 def create_app() -> FastAPI:
     app_instance = FastAPI(
         title="Precious",
         version=settings.VERSION,
         docs_url="/redoc",
         root_path=settings.APP_ROOT_PATH,
+        default_response_class=FastJSONResponse,
     )
     setup_routing(app_instance)
     setup_httpx_client(app_instance)
+    setup_admission_control(app_instance)
 
     return app_instance
@@ -6,3 +6,13 @@ import typing as t
 PROJECT_ROOT_PATH: t.Final[Path] = Path(
     os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
 )
+
+# Keyset pagination bounds for list endpoints
+DEFAULT_PAGE_LIMIT: t.Final[int] = 100
+MAX_PAGE_LIMIT: t.Final[int] = 1000
+
+# Rows fetched from the server side cursor and flushed to the client per chunk in streaming mode
+STREAM_CHUNK_SIZE: t.Final[int] = 1000
+
+# Rows accepted by a single bulk create request
+MAX_BULK_ROWS: t.Final[int] = 100_000
@@ -0,0 +1,29 @@
+import json
+from typing import Any
+from fastapi import HTTPException, Request
+
+from app.base.constants import MAX_BULK_ROWS
+from app.base.dependencies.streaming import NDJSON_MEDIA_TYPE
+
+
+async def get_bulk_rows(request: Request) -> list[Any]:
+    """
+    Rows of a bulk create request: a JSON array, or one JSON object per line when the body
+    is sent as `application/x-ndjson`. Rows are validated one by one by the servicer.
+    """
+    body = await request.body()
+
+    try:
+        if NDJSON_MEDIA_TYPE in request.headers.get("content-type", ""):
+            rows = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            rows = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {exc}")
+
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array")
+    if len(rows) > MAX_BULK_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ROWS} rows per request")
+
+    return rows
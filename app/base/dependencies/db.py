@@ -1,10 +1,91 @@
-from typing import AsyncGenerator
+from functools import lru_cache
+from typing import AsyncGenerator, Callable, Optional
 
+from fastapi import Request
+from fastapi.dependencies.models import Dependant
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.routing import Match
+from starlette.types import Scope
 
-from app.db.session import session_factory, SessionFactoryType
+from app.base.routing import (
+    DB_SESSION_STATE_KEY,
+    READ_ONLY_DB_SESSION_STATE_KEY,
+    reads_own_writes,
+)
+from app.db.session import (
+    read_only_session_factory,
+    session_factory,
+    SessionFactoryType,
+    Workload,
+)
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, SessionFactoryType]:
-    async with session_factory() as db_session:
-        yield db_session
\ No newline at end of file
+SessionDependency = Callable[[Request], AsyncGenerator[AsyncSession, SessionFactoryType]]
+
+
+def session_dependency(workload: Workload) -> SessionDependency:
+    """Write session from the pool of `workload`."""
+    async def get_workload_session(
+        request: Request,
+    ) -> AsyncGenerator[AsyncSession, SessionFactoryType]:
+        async with session_factory(workload) as db_session:
+            # committed and closed by `UnitOfWorkRoute` before the response is sent
+            setattr(request.state, DB_SESSION_STATE_KEY, db_session)
+            yield db_session
+
+    return get_workload_session
+
+
+def read_only_session_dependency(workload: Workload) -> SessionDependency:
+    """
+    Read-only session from the pool of `workload`; from the primary's pool, not a replica's,
+    while the client holds a read-your-writes token.
+    """
+    async def get_workload_read_only_session(
+        request: Request,
+    ) -> AsyncGenerator[AsyncSession, SessionFactoryType]:
+        primary = reads_own_writes(request)
+        async with read_only_session_factory(workload, primary=primary) as db_session:
+            # closed by `UnitOfWorkRoute` before the response is sent
+            setattr(request.state, READ_ONLY_DB_SESSION_STATE_KEY, db_session)
+            yield db_session
+
+    return get_workload_read_only_session
+
+
+get_session = session_dependency(Workload.WRITE)
+get_read_only_session = read_only_session_dependency(Workload.READ)
+get_critical_read_only_session = read_only_session_dependency(Workload.CRITICAL)
+get_bulk_read_only_session = read_only_session_dependency(Workload.BULK)
+
+SESSION_WORKLOADS: dict[Callable, Workload] = {
+    get_session: Workload.WRITE,
+    get_read_only_session: Workload.READ,
+    get_critical_read_only_session: Workload.CRITICAL,
+    get_bulk_read_only_session: Workload.BULK,
+}
+
+
+@lru_cache(maxsize=None)
+def _dependant_workload(dependant: Dependant) -> Optional[Workload]:
+    dependants = [dependant]
+    while dependants:
+        dependant = dependants.pop()
+        if dependant.call in SESSION_WORKLOADS:
+            return SESSION_WORKLOADS[dependant.call]
+        dependants += dependant.dependencies
+    return None
+
+
+def route_workload(scope: Scope) -> Optional[str]:
+    """
+    Workload of the pool the request's route takes its session from, or `None` for routes
+    without a session; used by `AdmissionControlMiddleware`, which runs before routing.
+    """
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            dependant = getattr(route, "dependant", None)
+            workload = _dependant_workload(dependant) if dependant is not None else None
+            return workload.value if workload is not None else None
+    return None
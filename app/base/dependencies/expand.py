@@ -0,0 +1,13 @@
+from typing import Optional
+from fastapi import Query
+
+
+async def get_expand(
+    expand: Optional[str] = Query(
+        None,
+        description="Comma separated relationships to embed, e.g. `customer,shipment,laptops`",
+    ),
+) -> list[str]:
+    if not expand:
+        return []
+    return [name.strip() for name in expand.split(",") if name.strip()]
@@ -0,0 +1,14 @@
+from typing import Optional
+from fastapi import Query
+
+
+async def get_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma separated columns to return, e.g. `manufacturer,model`; "
+                    "the primary key is always included",
+    ),
+) -> list[str]:
+    if not fields:
+        return []
+    return [name.strip() for name in fields.split(",") if name.strip()]
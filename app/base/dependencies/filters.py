@@ -0,0 +1,51 @@
+import re
+from typing import Optional
+from fastapi import Query, Request
+from pydantic import BaseModel
+
+# Query parameters consumed by other dependencies of the list endpoints
+RESERVED_PARAMS = frozenset({"limit", "after", "stream", "expand", "fields", "sort", "ids"})
+FILTER_PARAM = re.compile(r"^(?P<column>\w+)(\[(?P<operator>\w+)\])?$")
+
+
+class Filter(BaseModel):
+    column: str
+    operator: str = "eq"
+    value: str
+
+
+class Sorting(BaseModel):
+    column: Optional[str]
+    descending: bool = False
+
+
+async def get_filters(request: Request) -> list[Filter]:
+    """
+    Collects `column=value` and `column[operator]=value` query parameters,
+    e.g. `?order_status=pending&order_date[gte]=2024-01-01`.
+    Columns and operators are validated against the table by the servicer.
+    """
+    filters = []
+
+    for name, value in request.query_params.multi_items():
+        if name in RESERVED_PARAMS:
+            continue
+
+        match = FILTER_PARAM.match(name)
+        filters.append(
+            Filter(
+                column=match["column"] if match else name,
+                operator=(match["operator"] if match else None) or "eq",
+                value=value,
+            )
+        )
+
+    return filters
+
+
+async def get_sorting(
+    sort: Optional[str] = Query(None, description="Column to sort by, prefixed with `-` for descending"),
+) -> Sorting:
+    if not sort:
+        return Sorting(column=None)
+    return Sorting(column=sort.lstrip("-"), descending=sort.startswith("-"))
@@ -0,0 +1,14 @@
+from typing import Optional
+from fastapi import Query
+
+
+async def get_ids(
+    ids: Optional[str] = Query(
+        None,
+        description="Comma separated primary keys to fetch in one query, returned in the "
+                    "requested order; replaces pagination and sorting",
+    ),
+) -> list[str]:
+    if not ids:
+        return []
+    return [value.strip() for value in ids.split(",") if value.strip()]
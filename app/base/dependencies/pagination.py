@@ -0,0 +1,17 @@
+from typing import Optional
+from fastapi import Query
+from pydantic import BaseModel
+
+from app.base.constants import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+
+
+class Pagination(BaseModel):
+    limit: int
+    after: Optional[str]
+
+
+async def get_pagination(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    after: Optional[str] = Query(None, description="Opaque cursor taken from `next_cursor`"),
+) -> Pagination:
+    return Pagination(limit=limit, after=after)
@@ -0,0 +1,10 @@
+from fastapi import Query, Request
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def is_stream_requested(
+    request: Request,
+    stream: bool = Query(False, description=f"Stream rows as {NDJSON_MEDIA_TYPE}"),
+) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
@@ -0,0 +1,5 @@
+class InvalidQueryError(ValueError):
+    """
+    Raised when client supplied query parameters (cursor, sort, filters, ...)
+    can not be applied to the requested table. Translated to HTTP 400 by session_factory.
+    """
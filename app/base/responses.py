@@ -0,0 +1,97 @@
+import json
+import typing as t
+from uuid import UUID
+import orjson
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Row, inspect
+
+from app.base.dependencies.streaming import NDJSON_MEDIA_TYPE
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded by orjson, which writes UUID, date, datetime and Enum values itself;
+    the output is byte for byte what `JSONResponse` renders for the encoded content.
+    """
+
+    def render(self, content: t.Any) -> bytes:
+        return orjson.dumps(content, default=_encode_model)
+
+
+def _encode_model(value: t.Any) -> t.Any:
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, UUID):
+        # asyncpg's own UUID type, orjson only knows `uuid.UUID` itself
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def trusted_response(model: BaseModel, exclude_unset: bool = False) -> FastJSONResponse:
+    """
+    Response for a model the view has just built and validated. Returned as a `Response`,
+    FastAPI neither validates it against `response_model` again nor walks it with
+    `jsonable_encoder`; pass the route's `response_model_exclude_unset` as `exclude_unset`.
+    """
+    return FastJSONResponse(model.dict(exclude_unset=exclude_unset))
+
+
+def from_orm_loaded(schema: type[BaseModel], row: t.Any) -> BaseModel:
+    """
+    Same as `schema.from_orm(row)`, but relationships that were not loaded with the row are
+    left unset instead of being lazy loaded, so `response_model_exclude_unset` drops them.
+    Plain Core rows set exactly the columns they were selected with.
+    """
+    if isinstance(row, Row):
+        return schema.parse_obj(row._mapping)
+
+    state = inspect(row, raiseerr=False)
+    unloaded = state.unloaded if state is not None else set()
+
+    return schema.parse_obj(
+        {name: getattr(row, name) for name in schema.__fields__ if name not in unloaded}
+    )
+
+
+def ndjson_response(
+    partitions: t.AsyncIterator[t.Sequence[t.Any]],
+    schema: type[BaseModel],
+) -> StreamingResponse:
+    """
+    Serializes every partition of ORM rows into newline delimited JSON and flushes it
+    as one chunk, so only a single partition is held in memory at a time.
+    """
+    async def generate() -> t.AsyncIterator[bytes]:
+        async for rows in partitions:
+            yield b"".join(
+                orjson.dumps(
+                    from_orm_loaded(schema, row).dict(exclude_unset=True), default=_encode_model
+                ) + b"\n"
+                for row in rows
+            )
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def empty_update_response() -> JSONResponse:
+    """Rejects a PATCH request without any updatable field before touching the database."""
+    return JSONResponse(
+        status_code=400,
+        content={"status": 400, "message": "No data to update, please check your data."},
+    )
+
+
+def json_document_response(status: int, message: str, data: str) -> Response:
+    """
+    Wraps `data`, a JSON document already serialized by the database, in the standard
+    envelope without parsing it, so it is neither hydrated nor re-validated on the way out.
+    """
+    # same separators as `JSONResponse`, so the envelope matches the other endpoints
+    envelope = json.dumps(
+        {"status": status, "message": message}, ensure_ascii=False, separators=(",", ":")
+    )
+    return Response(
+        content=f'{envelope[:-1]},"data":{data}}}'.encode(),
+        media_type="application/json",
+    )
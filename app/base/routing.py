@@ -0,0 +1,84 @@
+import time
+import typing as t
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.base.settings import settings
+from app.db.session import replica_sets
+
+
+DB_SESSION_STATE_KEY: t.Final[str] = "db_session"
+READ_ONLY_DB_SESSION_STATE_KEY: t.Final[str] = "read_only_db_session"
+READ_YOUR_WRITES_COOKIE: t.Final[str] = "read_your_writes"
+
+
+def set_read_your_writes_token(response: Response) -> None:
+    """Pins the client's reads to the primary until its write has reached the replicas."""
+    window = settings.READ_YOUR_WRITES_WINDOW.total_seconds()
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        str(time.time() + window),
+        max_age=int(window) or 1,
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def reads_own_writes(request: Request) -> bool:
+    """
+    Whether the request carries a live read-your-writes token. Tokens further in the future
+    than the window were not issued by `set_read_your_writes_token` and are ignored.
+    """
+    try:
+        expires = float(request.cookies[READ_YOUR_WRITES_COOKIE])
+    except (KeyError, ValueError):
+        return False
+
+    now = time.time()
+    return now < expires <= now + settings.READ_YOUR_WRITES_WINDOW.total_seconds()
+
+
+class UnitOfWorkRoute(APIRoute):
+    """
+    Commits the request's write session exactly once, after the endpoint returned and its
+    response was rendered but before anything is sent to the client, then hands the
+    connections of both sessions back to the pool.
+
+    Exit code of `yield` dependencies only runs once the response is sent, so committing
+    there would acknowledge writes that may still fail to commit, and closing there would
+    keep a pooled connection checked out for as long as a slow client takes to read the
+    body. Streaming responses still query while they are sent; their sessions are closed
+    by the dependency once the stream is exhausted.
+
+    With read replicas configured, a committed write that did not answer with an error also
+    hands the client a read-your-writes token, see `set_read_your_writes_token`.
+    """
+
+    def get_route_handler(self) -> t.Callable[[Request], t.Coroutine[t.Any, t.Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def unit_of_work_route_handler(request: Request) -> Response:
+            response = await route_handler(request)
+
+            streaming = isinstance(response, StreamingResponse)
+
+            session: t.Optional[AsyncSession] = getattr(request.state, DB_SESSION_STATE_KEY, None)
+            if session is not None:
+                await session.commit()
+                # error responses, e.g. an empty update, wrote nothing worth pinning reads for
+                if replica_sets and response.status_code < 400:
+                    set_read_your_writes_token(response)
+                if not streaming:
+                    await session.close()
+
+            read_only_session: t.Optional[AsyncSession] = getattr(
+                request.state, READ_ONLY_DB_SESSION_STATE_KEY, None
+            )
+            if read_only_session is not None and not streaming:
+                await read_only_session.close()
+
+            return response
+
+        return unit_of_work_route_handler
@@ -0,0 +1,17 @@
+from typing import Any, List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class RowError(BaseModel):
+    # position of the rejected row in the request body
+    index: int
+    errors: List[dict[str, Any]]
+
+
+class BulkCreateResponse(BaseModel):
+    status: int
+    message: Optional[str]
+    # ids of the created records in request order, null for the rejected rows
+    data: List[Optional[UUID]]
+    errors: List[RowError]
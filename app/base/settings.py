@@ -1,11 +1,19 @@
 import os
 import sys
 from functools import lru_cache
-from pydantic import BaseSettings, validator, PostgresDsn, Field
+from pydantic import BaseModel, BaseSettings, validator, PostgresDsn, Field
 from datetime import timedelta
 from typing import Any, Dict, Optional
 
 
+class PoolSettings(BaseModel):
+    size: int = 10
+    max_overflow: int = 10
+    timeout: float = 120
+    recycle: int = -1  # seconds, -1 never recycles
+    pre_ping: bool = True
+
+
 class Settings(BaseSettings):
     APP_NAME: str = "Modulaptop Store"
     APP_ROOT_PATH: str = "/"
@@ -15,13 +23,35 @@ class Settings(BaseSettings):
     APPLICATION_PORT: int = 9030
     HTTP_CLIENT_TIMEOUT: timedelta = Field("PT60S")
 
+    # requests in flight per workload are limited to the connections of its pool
+    ADMISSION_QUEUE_SIZE: int = 50
+    ADMISSION_QUEUE_TIMEOUT: timedelta = Field("PT1S")
+    ADMISSION_RETRY_AFTER: timedelta = Field("PT1S")
+
     POSTGRES_SERVER: str = "localhost"
     POSTGRES_PORT: str = "5439"
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "password"
     POSTGRES_DB: str = "modulaptop_store_db"
     POSTGRES_APPLICATION_NAME: str = "modulaptop_store"
+    # one pool per workload, e.g. POSTGRES_POOL_READ__SIZE=20; keys left out of a nested
+    # variable fall back to the `PoolSettings` defaults, not to the ones below.
+    # Together the defaults open at most 20 connections per worker to the primary, the budget
+    # of the former single pool: critical 2, read 6+3, write 4+3, bulk 1+1. Every replica
+    # gets its own read and bulk pools, up to 11 connections per worker on that replica.
+    # Keep workers * 20 below the server's max_connections (100 by default).
+    POSTGRES_POOL_CRITICAL: PoolSettings = PoolSettings(size=2, max_overflow=0, timeout=5)
+    POSTGRES_POOL_READ: PoolSettings = PoolSettings(size=6, max_overflow=3, timeout=5)
+    POSTGRES_POOL_WRITE: PoolSettings = PoolSettings(size=4, max_overflow=3, timeout=5)
+    POSTGRES_POOL_BULK: PoolSettings = PoolSettings(size=1, max_overflow=1, timeout=5)
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements, 0 behind pgbouncer
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
+    # hot standbys serving the read and bulk read-only sessions, as a JSON list
+    POSTGRES_REPLICA_URIS: list[PostgresDsn] = []
+    # how long a replica that refused or dropped a connection is left out of the rotation
+    POSTGRES_REPLICA_COOLDOWN: timedelta = Field("PT30S")
+    # how long a client reads from the primary after it wrote
+    READ_YOUR_WRITES_WINDOW: timedelta = Field("PT5S")
 
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
@@ -1,6 +1,6 @@
-from uuid import uuid4
 from sqlalchemy import UUID, ForeignKey, Integer
 from app.db.base import Base
+from app.db.keys import uuid7
 from sqlalchemy.orm import Mapped, mapped_column
 
 
@@ -10,19 +10,21 @@ class ComponentOrderTable(Base):
     component_order_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4, nullable=False
+        default=uuid7, nullable=False
     )
 
     order_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("orders.order_id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     component_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("components.component_id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
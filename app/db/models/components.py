@@ -1,6 +1,6 @@
-from uuid import uuid4
 from sqlalchemy import UUID, Integer, String
 from app.db.base import Base
+from app.db.keys import uuid7
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.models.component_order import ComponentOrderTable
 from app.db.models.laptops_components import LaptopsComponentsTable
@@ -12,21 +12,23 @@ class ComponentsTable(Base):
     component_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=uuid7,
         nullable=False
     )
 
-    type: Mapped[str] = mapped_column(String(20), nullable=False)
+    type: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
     description: Mapped[str] = mapped_column(String(150), nullable=True)
-    make_year: Mapped[int] = mapped_column(Integer, nullable=False)
+    make_year: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
 
     laptops = relationship(
         "LaptopsTable",
         secondary=LaptopsComponentsTable.__table__,
-        back_populates="components"
+        back_populates="components",
+        passive_deletes=True
     )  # type: ignore
     orders = relationship(
         "OrdersTable",
         secondary=ComponentOrderTable.__table__,
-        back_populates="components"
+        back_populates="components",
+        passive_deletes=True
     )
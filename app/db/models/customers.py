@@ -1,8 +1,9 @@
+from typing import Optional
 from sqlalchemy import String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
-from uuid import uuid4
+from app.db.keys import uuid7
 
 
 class CustomersTable(Base):
@@ -11,11 +12,16 @@ class CustomersTable(Base):
     customer_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=uuid7,
         nullable=False
     )
     first_name: Mapped[str] = mapped_column(String(50), nullable=False)
-    last_name: Mapped[str] = mapped_column(String(50), nullable=False)
-    email: Mapped[str] = mapped_column(String(50))
+    last_name: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    email: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, index=True)
 
-    orders = relationship("OrdersTable", back_populates="customer")
+    orders = relationship(
+        "OrdersTable",
+        back_populates="customer",
+        cascade="all, delete",
+        passive_deletes=True
+    )
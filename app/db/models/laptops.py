@@ -1,6 +1,6 @@
-from uuid import uuid4
-from sqlalchemy import UUID, Integer, String
+from sqlalchemy import UUID, Index, Integer, String
 from app.db.base import Base
+from app.db.keys import uuid7
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.models.laptop_order import LaptopOrderTable
 from app.db.models.laptops_components import LaptopsComponentsTable
@@ -8,23 +8,33 @@ from app.db.models.laptops_components import LaptopsComponentsTable
 
 class LaptopsTable(Base):
     __tablename__ = "laptops"
+    __table_args__ = (
+        # index only scan for ?fields=manufacturer,model
+        Index(
+            "ix_laptops_laptop_id_covering",
+            "laptop_id",
+            postgresql_include=["manufacturer", "model"]
+        ),
+    )
 
     laptop_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4, nullable=False
+        default=uuid7, nullable=False
     )
-    manufacturer: Mapped[str] = mapped_column(String(20), nullable=False)
+    manufacturer: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
     model: Mapped[str] = mapped_column(String(20), nullable=False)
-    make_year: Mapped[int] = mapped_column(Integer, nullable=False)
+    make_year: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
 
     components = relationship(
         "ComponentsTable",
         secondary=LaptopsComponentsTable.__table__,
-        back_populates="laptops"
+        back_populates="laptops",
+        passive_deletes=True
     )  # type: ignore
     orders = relationship(
         "OrdersTable",
         secondary=LaptopOrderTable.__table__,
-        back_populates="laptops"
+        back_populates="laptops",
+        passive_deletes=True
     )
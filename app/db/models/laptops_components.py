@@ -17,5 +17,6 @@ class LaptopsComponentsTable(Base):
         UUID(as_uuid=True),
         ForeignKey("components.component_id", ondelete="CASCADE"),
         primary_key=True,
-        nullable=False
+        nullable=False,
+        index=True  # the primary key only serves lookups by laptop_id
     )
@@ -1,7 +1,7 @@
 import datetime
-from uuid import uuid4
-from sqlalchemy import UUID, Date, ForeignKey, String
+from sqlalchemy import UUID, Date, ForeignKey, Index, String
 from app.db.base import Base
+from app.db.keys import uuid7
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.models.component_order import ComponentOrderTable
 from app.db.models.laptop_order import LaptopOrderTable
@@ -9,11 +9,18 @@ from app.db.models.laptop_order import LaptopOrderTable
 
 class OrdersTable(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # keyset pagination over ORDER BY <column>, order_id
+        Index("ix_orders_order_date_order_id", "order_date", "order_id"),
+        Index("ix_orders_order_status_order_id", "order_status", "order_id"),
+        # index only scan for ?fields=order_status
+        Index("ix_orders_order_id_covering", "order_id", postgresql_include=["order_status"]),
+    )
 
     order_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=uuid7,
         nullable=False
     )
     order_date: Mapped[datetime.date] = mapped_column(Date(), nullable=False)
@@ -22,13 +29,15 @@ class OrdersTable(Base):
     customer_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("customers.customer_id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     shipment_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("shipments.shipment_id", ondelete="CASCADE"),
-        nullable=True
+        nullable=True,
+        index=True
     )
 
     customer = relationship("CustomersTable", back_populates="orders")
@@ -36,10 +45,12 @@ class OrdersTable(Base):
     laptops = relationship(
         "LaptopsTable",
         secondary=LaptopOrderTable.__table__,
-        back_populates="orders"
+        back_populates="orders",
+        passive_deletes=True
     )
     components = relationship(
         "ComponentsTable",
         secondary=ComponentOrderTable.__table__,
-        back_populates="orders"
+        back_populates="orders",
+        passive_deletes=True
     )
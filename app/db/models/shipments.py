@@ -1,21 +1,31 @@
 from datetime import date
-from uuid import uuid4
-from sqlalchemy import UUID, Date, String
+from sqlalchemy import UUID, Date, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
+from app.db.keys import uuid7
 
 
 class ShipmentsTable(Base):
     __tablename__ = "shipments"
+    __table_args__ = (
+        # keyset pagination over ORDER BY <column>, shipment_id
+        Index("ix_shipments_shipment_date_shipment_id", "shipment_date", "shipment_id"),
+        Index("ix_shipments_shipment_status_shipment_id", "shipment_status", "shipment_id"),
+    )
 
     shipment_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=uuid7,
         nullable=False
     )
     shipment_date: Mapped[date] = mapped_column(Date(), nullable=False)
     shipment_status: Mapped[str] = mapped_column(String(20), nullable=False)
     shipment_address: Mapped[str] = mapped_column(String(100), nullable=False)
 
-    orders = relationship('OrdersTable', back_populates="shipment")
+    orders = relationship(
+        'OrdersTable',
+        back_populates="shipment",
+        cascade="all, delete",
+        passive_deletes=True
+    )
@@ -0,0 +1,84 @@
+import threading
+import time
+import typing as t
+from bisect import bisect_left
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, PoolProxiedConnection
+
+
+# upper bounds, in seconds, of the checkout wait-time histogram buckets
+WAIT_TIME_BUCKETS: t.Final[tuple[float, ...]] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+
+class PoolStats:
+    """Counters collected by `InstrumentedQueuePool`; they survive `engine.dispose()`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.wait_time_counts = [0] * (len(WAIT_TIME_BUCKETS) + 1)  # last one is +Inf
+        self.wait_time_sum = 0.0
+        self.checkouts = 0
+        self.pre_ping_failures = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_time_counts[bisect_left(WAIT_TIME_BUCKETS, seconds)] += 1
+            self.wait_time_sum += seconds
+            self.checkouts += 1
+
+    def record_pre_ping_failure(self) -> None:
+        with self._lock:
+            self.pre_ping_failures += 1
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default pool of async engines, plus `PoolStats`.
+
+    `_do_get` is where a checkout blocks until a connection is returned or may be opened,
+    so timing it gives the pool wait time. A failed pre-ping invalidates the pool with a
+    `DisconnectionError`, which is what `_invalidate` counts.
+    """
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = t.cast(InstrumentedQueuePool, super().recreate())
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.observe_wait(time.perf_counter() - started)
+
+    def _invalidate(
+        self,
+        connection: PoolProxiedConnection,
+        exception: t.Optional[BaseException] = None,
+        _checkin: bool = True,
+    ) -> None:
+        if isinstance(exception, exc.DisconnectionError):
+            self.stats.record_pre_ping_failure()
+        super()._invalidate(connection, exception, _checkin)
+
+
+def pool_status(pool: InstrumentedQueuePool) -> dict[str, t.Any]:
+    stats = pool.stats
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # negative while fewer than `size` connections have been opened
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": stats.checkouts,
+        "wait_time_seconds_sum": stats.wait_time_sum,
+        "pre_ping_failures": stats.pre_ping_failures,
+    }
@@ -0,0 +1,38 @@
+import itertools
+import time
+import typing as t
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class ReplicaSet:
+    """
+    Round-robin over the engines of the read replicas. A replica whose connection failed is
+    skipped for `cooldown` seconds; with every replica skipped, `choose` returns `None` and
+    the caller reads from the primary.
+    """
+
+    def __init__(self, engines: t.Sequence[AsyncEngine], cooldown: float) -> None:
+        self.engines = list(engines)
+        self._cooldown = cooldown
+        self._down_until: dict[AsyncEngine, float] = {}
+        self._next = itertools.cycle(range(len(self.engines)))
+
+    def choose(self) -> t.Optional[AsyncEngine]:
+        now = time.monotonic()
+        for _ in self.engines:
+            engine = self.engines[next(self._next)]
+            if self._down_until.get(engine, 0) <= now:
+                return engine
+        return None
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        self._down_until[engine] = time.monotonic() + self._cooldown
+
+
+def is_connection_error(exc: BaseException) -> bool:
+    """Refused or dropped connections, as opposed to errors in the query itself."""
+    if isinstance(exc, DBAPIError):
+        return exc.connection_invalidated
+    return isinstance(exc, OSError)
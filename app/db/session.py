@@ -1,3 +1,4 @@
+import enum
 import logging
 import typing as t
 import asyncpg
@@ -6,32 +7,126 @@ from fastapi import HTTPException
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError, NoResultFound, DBAPIError
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    async_sessionmaker,
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+
+from app.base.exceptions import InvalidQueryError
+from app.base.settings import PoolSettings, settings
+from app.db.pool import InstrumentedQueuePool
+from app.db.replicas import is_connection_error, ReplicaSet
 
-from app.base.settings import settings
+
+def _async_uri(uri: str) -> str:
+    return uri.replace(
+        "postgresql",
+        "postgresql+asyncpg",
+        1,
+    )
 
 
 assert settings.SQLALCHEMY_DATABASE_URI
-ASYNC_URI: str = settings.SQLALCHEMY_DATABASE_URI.replace(
-    "postgresql",
-    "postgresql+asyncpg",
-    1,
-)
+ASYNC_URI: str = _async_uri(settings.SQLALCHEMY_DATABASE_URI)
 
-engine = create_async_engine(
-    ASYNC_URI,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    pool_timeout=120,
-    connect_args={"server_settings": {"application_name": settings.POSTGRES_APPLICATION_NAME}},
-)
-async_session = async_sessionmaker(
-    engine,
-    autocommit=False,
-    autoflush=False,
-    expire_on_commit=False,
-)
+# SQLSTATE of an insert or update that references a row that does not exist
+FOREIGN_KEY_VIOLATION: t.Final[str] = "23503"
+
+
+class Workload(str, enum.Enum):
+    """
+    Every workload gets its own engine and pool, so one kind of traffic cannot starve another:
+    `critical` serves the healthcheck, `bulk` the heavy nested list reads.
+    """
+
+    CRITICAL = "critical"
+    READ = "read"
+    WRITE = "write"
+    BULK = "bulk"
+
+
+def _create_engine(pool_settings: PoolSettings, uri: str = ASYNC_URI) -> AsyncEngine:
+    return create_async_engine(
+        uri,
+        echo=settings.DEBUG,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=pool_settings.pre_ping,
+        pool_size=pool_settings.size,
+        max_overflow=pool_settings.max_overflow,
+        pool_timeout=pool_settings.timeout,
+        pool_recycle=pool_settings.recycle,
+        connect_args={
+            "server_settings": {"application_name": settings.POSTGRES_APPLICATION_NAME},
+            "statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+pool_settings: dict[Workload, PoolSettings] = {
+    Workload.CRITICAL: settings.POSTGRES_POOL_CRITICAL,
+    Workload.READ: settings.POSTGRES_POOL_READ,
+    Workload.WRITE: settings.POSTGRES_POOL_WRITE,
+    Workload.BULK: settings.POSTGRES_POOL_BULK,
+}
+engines: dict[Workload, AsyncEngine] = {
+    workload: _create_engine(workload_pool_settings)
+    for workload, workload_pool_settings in pool_settings.items()
+}
+engine = engines[Workload.WRITE]
+
+# read-only sessions of these workloads go to the replicas, when there are any
+replica_sets: dict[Workload, ReplicaSet] = {
+    workload: ReplicaSet(
+        [
+            _create_engine(pool_settings[workload], _async_uri(uri))
+            for uri in settings.POSTGRES_REPLICA_URIS
+        ],
+        cooldown=settings.POSTGRES_REPLICA_COOLDOWN.total_seconds(),
+    )
+    for workload in (Workload.READ, Workload.BULK)
+    if settings.POSTGRES_REPLICA_URIS
+}
+
+async_sessions: dict[Workload, async_sessionmaker[AsyncSession]] = {
+    workload: async_sessionmaker(
+        workload_engine,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    for workload, workload_engine in engines.items()
+}
+async_session = async_sessions[Workload.WRITE]
+read_only_sessions: dict[Workload, async_sessionmaker[AsyncSession]] = {
+    workload: async_sessionmaker(
+        workload_engine.execution_options(postgresql_readonly=True),
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    for workload, workload_engine in engines.items()
+}
+read_only_replicas: dict[AsyncEngine, AsyncEngine] = {
+    replica_engine: replica_engine.execution_options(postgresql_readonly=True)
+    for replica_set in replica_sets.values()
+    for replica_engine in replica_set.engines
+}
+
+
+def named_engines() -> dict[str, AsyncEngine]:
+    """Every engine by the name its pool is reported under, e.g. `read` or `read_replica_0`."""
+    named = {workload.value: workload_engine for workload, workload_engine in engines.items()}
+    for workload, replica_set in replica_sets.items():
+        for index, replica_engine in enumerate(replica_set.engines):
+            named[f"{workload.value}_replica_{index}"] = replica_engine
+    return named
+
+
+async def dispose_engines() -> None:
+    for workload_engine in named_engines().values():
+        await workload_engine.dispose()
 
 
 def _can_commit_transaction_with_exception(exc: Exception) -> bool:
@@ -41,7 +136,9 @@ def _can_commit_transaction_with_exception(exc: Exception) -> bool:
 
 
 @asynccontextmanager
-async def session_factory() -> t.AsyncGenerator[AsyncSession, None]:
+async def session_factory(
+    workload: Workload = Workload.WRITE,
+) -> t.AsyncGenerator[AsyncSession, None]:
     """
     All endpoints should be wrapped into session_factory context manager.
     Knows transaction issues in fastAPI:
@@ -53,25 +150,99 @@ async def session_factory() -> t.AsyncGenerator[AsyncSession, None]:
         custom exception handlers [https://fastapi.tiangolo.com/tutorial/handling-errors/].
 
     Third workaround, `session_decorator`, is less explicit than `context manager`.
+
+    The session is a unit of work: servicer functions only flush and the whole request is
+    committed once (by `UnitOfWorkRoute` for API routes). Use `session.begin_nested()` for
+    a savepoint that can fail without aborting the rest of the request.
     """
-    async with async_session() as session:
+    async with async_sessions[workload]() as session:
         try:
             yield session
         except Exception as exc:
-            if not _can_commit_transaction_with_exception(exc):
+            if _can_commit_transaction_with_exception(exc):
+                await session.commit()
+            else:
                 await session.rollback()
+            _raise_for_exception(exc)
+        else:
+            await session.commit()
+        finally:
+            await session.close()
 
-            logger = logging.getLogger(__name__)
 
-            if isinstance(exc, NoResultFound):
-                logger.error(f"NoResultFound: {exc}")
-                raise HTTPException(status_code=404, detail=str(exc))
-            else:
-                logger.error(f"An error occured: {exc}")
-            raise
+@asynccontextmanager
+async def read_only_session_factory(
+    workload: Workload = Workload.READ,
+    primary: bool = False,
+) -> t.AsyncGenerator[AsyncSession, None]:
+    """
+    Session for endpoints that only read, from the pool of the given workload.
+
+    Replicated workloads read from the next healthy replica unless `primary` is set, which
+    is how a client reads its own writes before they have been replicated.
+
+    The transaction is opened as `READ ONLY` and is never committed: closing the session
+    rolls it back and hands the connection back to the pool.
+    """
+    replica_set = None if primary else replica_sets.get(workload)
+    session, replica = await _connect_read_only(workload, replica_set)
+
+    async with session:
+        try:
+            yield session
+        except Exception as exc:
+            if replica is not None and is_connection_error(exc):
+                replica_sets[workload].mark_down(replica)
+            _raise_for_exception(exc)
         finally:
-            await session.commit()
             await session.close()
 
 
+async def _connect_read_only(
+    workload: Workload,
+    replica_set: t.Optional[ReplicaSet],
+) -> tuple[AsyncSession, t.Optional[AsyncEngine]]:
+    """
+    Checks a connection out of the next healthy replica right away, so a replica that is down
+    is left out of the rotation before the endpoint runs instead of failing the request.
+    """
+    make_session = read_only_sessions[workload]
+
+    while replica_set is not None and (replica := replica_set.choose()) is not None:
+        session = make_session(bind=read_only_replicas[replica])
+        try:
+            await session.connection()
+        except Exception as exc:
+            await session.close()
+            if not is_connection_error(exc):
+                raise
+            replica_set.mark_down(replica)
+        else:
+            return session, replica
+
+    return make_session(), None
+
+
+def _raise_for_exception(exc: Exception) -> t.NoReturn:
+    logger = logging.getLogger(__name__)
+
+    if isinstance(exc, NoResultFound):
+        logger.error(f"NoResultFound: {exc}")
+        raise HTTPException(status_code=404, detail=str(exc))
+    elif isinstance(exc, InvalidQueryError):
+        logger.error(f"InvalidQueryError: {exc}")
+        raise HTTPException(status_code=400, detail=str(exc))
+    elif (
+        isinstance(exc, IntegrityError)
+        and getattr(exc.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION
+    ):
+        # e.g. Key (laptop_id)=(...) is not present in table "laptops".
+        logger.error(f"IntegrityError: {exc}")
+        detail = getattr(exc.orig.__cause__, "detail", None) or "Referenced record not found"
+        raise HTTPException(status_code=404, detail=detail)
+    else:
+        logger.error(f"An error occured: {exc}")
+    raise
+
+
 SessionFactoryType: t.TypeAlias = t.Callable[..., t.AsyncContextManager[AsyncSession]]
@@ -1,6 +1,21 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends
-from app.base.dependencies.db import get_session
+from app.base.dependencies.bulk import get_bulk_rows
+from app.base.dependencies.db import get_read_only_session, get_session
+from app.base.dependencies.expand import get_expand
+from app.base.dependencies.fields import get_fields
+from app.base.dependencies.filters import Filter, Sorting, get_filters, get_sorting
+from app.base.dependencies.ids import get_ids
+from app.base.dependencies.pagination import Pagination, get_pagination
+from app.base.dependencies.streaming import is_stream_requested
+from app.base.responses import (
+    empty_update_response,
+    from_orm_loaded,
+    ndjson_response,
+    trusted_response
+)
+from app.base.routing import UnitOfWorkRoute
+from app.base.schemas import BulkCreateResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.components import ComponentsTable
 
@@ -9,25 +24,30 @@ from app.modules.components.schemas import (
     Component,
     CreateComponentResponse,
     PatchComponent,
-    StandardComponentResponse,
     DeleteComponentResponse,
 )
 from app.modules.laptops_components.schemas import (
+    ComponentExpandedData,
+    ComponentExpandedResponse,
     ComponentLaptopsData,
-    ComponentLaptopsResponse
+    ComponentLaptopsResponse,
+    ComponentsExpandedResponse
 )
 
 from app.modules.servicer import (
+    bulk_insert,
     delete_record,
     insert_into,
-    select_all,
+    select_many,
+    select_page,
     select_specific,
     select_specific_extended,
+    stream_all,
     update_record,
 )
 
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 # CREATE
@@ -36,46 +56,138 @@ async def create_component(
     insert_data: Component,
     session: AsyncSession = Depends(get_session)
 ):
-    component: ComponentsTable = await insert_into(
+    component = await insert_into(
         session=session, table_schema=ComponentsTable, insert_data=insert_data
     )
 
-    return CreateComponentResponse(
-        status=201,
-        message="Component created successfully",
-        data=ComponentData.from_orm(component),
+    return trusted_response(
+        CreateComponentResponse(
+            status=201,
+            message="Component created successfully",
+            data=ComponentData.from_orm(component),
+        )
+    )
+
+
+# CREATE - many, from a JSON array or NDJSON body
+@router.post("/api/components/bulk", tags=["components"], response_model=BulkCreateResponse)
+async def create_components(
+    rows: list = Depends(get_bulk_rows),
+    session: AsyncSession = Depends(get_session)
+):
+    ids, errors = await bulk_insert(
+        session=session,
+        table_schema=ComponentsTable,
+        insert_schema=Component,
+        rows=rows
+    )
+
+    return trusted_response(
+        BulkCreateResponse(
+            status=201,
+            message=f"Components created: {len(rows) - len(errors)}, rejected: {len(errors)}",
+            data=ids,
+            errors=errors
+        )
     )
 
 
 # READ - all
-@router.get("/api/components", tags=["components"], response_model=StandardComponentResponse)
-async def get_components(session: AsyncSession = Depends(get_session)):
-    components: list[ComponentsTable] = await select_all(
+@router.get(
+    "/api/components",
+    tags=["components"],
+    response_model=ComponentsExpandedResponse,
+    response_model_exclude_unset=True
+)
+async def get_components(
+    pagination: Pagination = Depends(get_pagination),
+    filters: list[Filter] = Depends(get_filters),
+    sorting: Sorting = Depends(get_sorting),
+    expand: list[str] = Depends(get_expand),
+    fields: list[str] = Depends(get_fields),
+    ids: list[str] = Depends(get_ids),
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_read_only_session)
+):
+    if ids:
+        components, missing_ids = await select_many(
+            session=session,
+            table_schema=ComponentsTable,
+            ids=ids,
+            expand=expand,
+            fields=fields,
+            filters=filters
+        )
+
+        return trusted_response(
+            ComponentsExpandedResponse(
+                status=200,
+                message="Components retrieved successfully",
+                data=[from_orm_loaded(ComponentExpandedData, component) for component in components],
+                missing_ids=missing_ids
+            ),
+            exclude_unset=True
+        )
+
+    if stream:
+        return ndjson_response(
+            stream_all(
+                session=session,
+                table_schema=ComponentsTable,
+                expand=expand,
+                fields=fields,
+                filters=filters
+            ),
+            ComponentExpandedData
+        )
+
+    components, next_cursor = await select_page(
         session=session,
-        table_schema=ComponentsTable
+        table_schema=ComponentsTable,
+        limit=pagination.limit,
+        after=pagination.after,
+        order_by=sorting.column,
+        descending=sorting.descending,
+        expand=expand,
+        fields=fields,
+        filters=filters
     )
 
-    return StandardComponentResponse(
-        status=200,
-        message="Components retrieved successfully",
-        data=[ComponentData.from_orm(component) for component in components],
+    return trusted_response(
+        ComponentsExpandedResponse(
+            status=200,
+            message="Components retrieved successfully",
+            data=[from_orm_loaded(ComponentExpandedData, component) for component in components],
+            next_cursor=next_cursor
+        ),
+        exclude_unset=True
     )
 
 
 # READ - specific
-@router.get("/api/components/{component_id}", tags=["components"], response_model=CreateComponentResponse)
+@router.get(
+    "/api/components/{component_id}",
+    tags=["components"],
+    response_model=ComponentExpandedResponse,
+    response_model_exclude_unset=True
+)
 async def get_component(
     component_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    expand: list[str] = Depends(get_expand),
+    fields: list[str] = Depends(get_fields),
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     component: ComponentsTable = await select_specific(
-        session=session, table_schema=ComponentsTable, id=component_id
+        session=session, table_schema=ComponentsTable, id=component_id, expand=expand, fields=fields
     )
 
-    return CreateComponentResponse(
-        status=200,
-        message="Component retrieved successfully",
-        data=ComponentData.from_orm(component),
+    return trusted_response(
+        ComponentExpandedResponse(
+            status=200,
+            message="Component retrieved successfully",
+            data=from_orm_loaded(ComponentExpandedData, component),
+        ),
+        exclude_unset=True
     )
 
 
@@ -88,23 +200,21 @@ async def update_component(
 ):
     update_data_dict = update_data.dict(exclude_none=True, exclude_unset=True)
 
-    component: ComponentsTable = await update_record(
+    if len(update_data_dict) == 0:
+        return empty_update_response()
+
+    component = await update_record(
         session=session, table_schema=ComponentsTable,
         id=component_id,
         update_data=update_data
     )
 
-    if len(update_data_dict) == 0:
-        return CreateComponentResponse(
-            status=400,
-            message="No data to update, please check your data.",
-            data=ComponentData.from_orm(component)
+    return trusted_response(
+        CreateComponentResponse(
+            status=200,
+            message="Component updated successfully",
+            data=ComponentData.from_orm(component),
         )
-
-    return CreateComponentResponse(
-        status=200,
-        message="Component updated successfully",
-        data=ComponentData.from_orm(component),
     )
 
 
@@ -120,9 +230,11 @@ async def delete_laptop(
         id=component_id
     )
 
-    return DeleteComponentResponse(
-        status=200,
-        message="Component deleted successfully"
+    return trusted_response(
+        DeleteComponentResponse(
+            status=200,
+            message="Component deleted successfully"
+        )
     )
 
 
@@ -130,7 +242,7 @@ async def delete_laptop(
 @router.get("/api/components/{component_id}/laptops", tags=["laptops"], response_model=ComponentLaptopsResponse,)
 async def get_laptop_components(
     component_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     component: ComponentsTable = await select_specific_extended(
         session=session,
@@ -139,8 +251,10 @@ async def get_laptop_components(
         attribute_name="laptops"
     )
 
-    return ComponentLaptopsResponse(
-        status=200,
-        message="Component compatible laptops retrieved successfully",
-        data=ComponentLaptopsData.from_orm(component),
+    return trusted_response(
+        ComponentLaptopsResponse(
+            status=200,
+            message="Component compatible laptops retrieved successfully",
+            data=ComponentLaptopsData.from_orm(component),
+        )
     )
@@ -1,34 +1,59 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.base.dependencies.db import get_session
+from app.base.dependencies.bulk import get_bulk_rows
+from app.base.dependencies.db import (
+    get_bulk_read_only_session,
+    get_read_only_session,
+    get_session
+)
+from app.base.dependencies.expand import get_expand
+from app.base.dependencies.fields import get_fields
+from app.base.dependencies.filters import Filter, Sorting, get_filters, get_sorting
+from app.base.dependencies.ids import get_ids
+from app.base.dependencies.pagination import Pagination, get_pagination
+from app.base.dependencies.streaming import is_stream_requested
+from app.base.responses import (
+    empty_update_response,
+    from_orm_loaded,
+    json_document_response,
+    ndjson_response,
+    trusted_response
+)
+from app.base.routing import UnitOfWorkRoute
+from app.base.schemas import BulkCreateResponse
 from app.db.models.customers import CustomersTable
 from app.modules.customers.schemas import (
     CustomerData,
     Customer,
     PatchCustomer,
-    StandardCustomersResponse,
     StandardCustomerResponse,
     DeleteCustomerResponse,
 )
 from app.modules.orders.schemas import (
+    CustomerExpandedData,
+    CustomerExpandedResponse,
     CustomerOrdersData,
     CustomerOrdersResponse,
+    CustomersExpandedResponse,
     CustomersOrdersResponse
 )
 
 from app.modules.servicer import (
+    bulk_insert,
     delete_record,
     insert_into,
-    select_all,
-    select_all_extended,
+    select_all_extended_json,
+    select_many,
+    select_page,
     select_specific,
     select_specific_extended,
+    stream_all,
     update_record,
 )
 
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 # CREATE
@@ -37,66 +62,171 @@ async def create_customer(
     customer_data: Customer,
     session: AsyncSession = Depends(get_session)
 ):
-    customer: CustomersTable = await insert_into(
+    customer = await insert_into(
         session=session,
         table_schema=CustomersTable,
         insert_data=customer_data
     )
 
-    return StandardCustomerResponse(
-        status=201,
-        message="Customer created successfully",
-        data=CustomerData.from_orm(customer)
+    return trusted_response(
+        StandardCustomerResponse(
+            status=201,
+            message="Customer created successfully",
+            data=CustomerData.from_orm(customer)
+        )
+    )
+
+
+# CREATE - many, from a JSON array or NDJSON body
+@router.post("/api/customers/bulk", tags=["customers"], response_model=BulkCreateResponse)
+async def create_customers(
+    rows: list = Depends(get_bulk_rows),
+    session: AsyncSession = Depends(get_session)
+):
+    ids, errors = await bulk_insert(
+        session=session,
+        table_schema=CustomersTable,
+        insert_schema=Customer,
+        rows=rows
+    )
+
+    return trusted_response(
+        BulkCreateResponse(
+            status=201,
+            message=f"Customers created: {len(rows) - len(errors)}, rejected: {len(errors)}",
+            data=ids,
+            errors=errors
+        )
     )
 
 
 # READ
-@router.get("/api/customers", tags=["customers"], response_model=StandardCustomersResponse)
-async def get_customers(session: AsyncSession = Depends(get_session)):
-    customers: list[CustomersTable] = await select_all(
+@router.get(
+    "/api/customers",
+    tags=["customers"],
+    response_model=CustomersExpandedResponse,
+    response_model_exclude_unset=True
+)
+async def get_customers(
+    pagination: Pagination = Depends(get_pagination),
+    filters: list[Filter] = Depends(get_filters),
+    sorting: Sorting = Depends(get_sorting),
+    expand: list[str] = Depends(get_expand),
+    fields: list[str] = Depends(get_fields),
+    ids: list[str] = Depends(get_ids),
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_read_only_session)
+):
+    if ids:
+        customers, missing_ids = await select_many(
+            session=session,
+            table_schema=CustomersTable,
+            ids=ids,
+            expand=expand,
+            fields=fields,
+            filters=filters
+        )
+
+        return trusted_response(
+            CustomersExpandedResponse(
+                status=200,
+                message="Customers sucessfully retrieved",
+                data=[from_orm_loaded(CustomerExpandedData, customer) for customer in customers],
+                missing_ids=missing_ids
+            ),
+            exclude_unset=True
+        )
+
+    if stream:
+        return ndjson_response(
+            stream_all(
+                session=session,
+                table_schema=CustomersTable,
+                expand=expand,
+                fields=fields,
+                filters=filters
+            ),
+            CustomerExpandedData
+        )
+
+    customers, next_cursor = await select_page(
         session=session,
-        table_schema=CustomersTable
+        table_schema=CustomersTable,
+        limit=pagination.limit,
+        after=pagination.after,
+        order_by=sorting.column,
+        descending=sorting.descending,
+        expand=expand,
+        fields=fields,
+        filters=filters
     )
 
-    return StandardCustomersResponse(
-        status=200,
-        message="Customers sucessfully retrieved",
-        data=[CustomerData.from_orm(customer) for customer in customers],
+    return trusted_response(
+        CustomersExpandedResponse(
+            status=200,
+            message="Customers sucessfully retrieved",
+            data=[from_orm_loaded(CustomerExpandedData, customer) for customer in customers],
+            next_cursor=next_cursor
+        ),
+        exclude_unset=True
     )
 
 
 # READ - customers' orders
 @router.get("/api/customers/orders", tags=["customers"], response_model=CustomersOrdersResponse)
-async def get_customers_orders(session: AsyncSession = Depends(get_session)):
-    customers: list[CustomersTable] = await select_all_extended(
+async def get_customers_orders(
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_bulk_read_only_session)
+):
+    if stream:
+        return ndjson_response(
+            stream_all(session=session, table_schema=CustomersTable, expand=["orders"]),
+            CustomerOrdersData
+        )
+
+    # the JSON is written by Postgres and passed through as is
+    customers = await select_all_extended_json(
         session=session,
         table_schema=CustomersTable,
-        attribute_name="orders"
+        attribute_name="orders",
+        schema=CustomerOrdersData
     )
 
-    return CustomersOrdersResponse(
+    return json_document_response(
         status=200,
         message="Customers sucessfully retrieved",
-        data=[CustomerOrdersData.from_orm(customer) for customer in customers],
+        data=f"[{','.join(customers)}]"
     )
 
 
 # READ - specific customer
-@router.get("/api/customers/{customer_id}", tags=["customers"], response_model=StandardCustomerResponse)
+@router.get(
+    "/api/customers/{customer_id}",
+    tags=["customers"],
+    response_model=CustomerExpandedResponse,
+    response_model_exclude_unset=True
+)
 async def get_customer(
     customer_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    expand: list[str] = Depends(get_expand),
+    fields: list[str] = Depends(get_fields),
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     customer: CustomersTable = await select_specific(
         session=session,
         table_schema=CustomersTable,
-        id=customer_id
+        id=customer_id,
+        expand=expand,
+        fields=fields
     )
 
-    return StandardCustomerResponse(
-        status=200,
-        message="Customer sucessfully retrieved",
-        data=CustomerData.from_orm(customer)
+    return trusted_response(
+        CustomerExpandedResponse(
+            status=200,
+            message="Customer sucessfully retrieved",
+            data=from_orm_loaded(CustomerExpandedData, customer)
+        ),
+        exclude_unset=True
     )
 
 
@@ -106,7 +236,7 @@ async def get_customer(
 )
 async def get_customer_orders(
     customer_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     customer: CustomersTable = await select_specific_extended(
         session=session,
@@ -115,10 +245,12 @@ async def get_customer_orders(
         attribute_name="orders"
     )
 
-    return CustomerOrdersResponse(
-        status=200,
-        message="Customer and orders sucessfully retrieved",
-        data=CustomerOrdersData.from_orm(customer),
+    return trusted_response(
+        CustomerOrdersResponse(
+            status=200,
+            message="Customer and orders sucessfully retrieved",
+            data=CustomerOrdersData.from_orm(customer),
+        )
     )
 
 
@@ -131,6 +263,9 @@ async def update_customer(
 ):
     update_data_dict = update_data.dict(exclude_none=True, exclude_unset=True)
 
+    if len(update_data_dict) == 0:
+        return empty_update_response()
+
     customer = await update_record(
         session=session,
         table_schema=CustomersTable,
@@ -138,17 +273,12 @@ async def update_customer(
         update_data=update_data
     )
 
-    if len(update_data_dict) == 0:
-        return StandardCustomerResponse(
-            status=400,
-            message="No data to update, please check your data.",
+    return trusted_response(
+        StandardCustomerResponse(
+            status=200,
+            message="Customer updated successfully",
             data=CustomerData.from_orm(customer)
         )
-
-    return StandardCustomerResponse(
-        status=200,
-        message="Customer updated successfully",
-        data=CustomerData.from_orm(customer)
     )
 
 
@@ -164,7 +294,9 @@ async def delete_customer(
         id=customer_id
     )
 
-    return DeleteCustomerResponse(
-        status=200,
-        message="Customer deleted successfully"
+    return trusted_response(
+        DeleteCustomerResponse(
+            status=200,
+            message="Customer deleted successfully"
+        )
     )
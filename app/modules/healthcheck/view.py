@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.base.dependencies.db import get_session
+from app.base.dependencies.db import get_critical_read_only_session
+from app.base.routing import UnitOfWorkRoute
+from app.db.pool import pool_status
+from app.db.session import named_engines
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/api/healthcheck", tags=["healthcheck"])
 async def healthcheck(
     request: Request,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_critical_read_only_session),
 ):
     is_database_working = True
     output = "ok"
@@ -25,4 +28,5 @@ async def healthcheck(
         "is_database_working": is_database_working,
         "output": output,
         "version": request.app.version,
+        "pools": {name: pool_status(engine.pool) for name, engine in named_engines().items()},
     }
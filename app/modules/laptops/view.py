@@ -2,33 +2,52 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.base.dependencies.db import get_session
+from app.base.dependencies.bulk import get_bulk_rows
+from app.base.dependencies.db import get_read_only_session, get_session
+from app.base.dependencies.expand import get_expand
+from app.base.dependencies.fields import get_fields
+from app.base.dependencies.filters import Filter, Sorting, get_filters, get_sorting
+from app.base.dependencies.ids import get_ids
+from app.base.dependencies.pagination import Pagination, get_pagination
+from app.base.dependencies.streaming import is_stream_requested
+from app.base.responses import (
+    empty_update_response,
+    from_orm_loaded,
+    ndjson_response,
+    trusted_response
+)
+from app.base.routing import UnitOfWorkRoute
+from app.base.schemas import BulkCreateResponse
 from app.db.models.components import ComponentsTable
 from app.db.models.laptops import LaptopsTable
 from app.db.models.laptops_components import LaptopsComponentsTable
 from app.modules.laptops_components.schemas import (
     LaptopComponentsData,
-    LaptopComponentsResponse
+    LaptopComponentsResponse,
+    LaptopExpandedData,
+    LaptopsExpandedResponse
 )
 from app.modules.laptops.schemas import (
     CreateLaptopResponse,
     Laptop,
     PatchLaptop,
     LaptopData,
-    StandardLaptopResponse,
     DeleteLaptopResponse,
 )
 from app.modules.servicer import (
+    bulk_insert,
     delete_record,
     insert_into,
-    select_all,
+    select_many,
+    select_page,
     select_specific,
     select_specific_extended,
+    stream_all,
     update_record,
 )
 
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 # CREATE
@@ -37,47 +56,144 @@ async def create_laptop(
     insert_data: Laptop,
     session: AsyncSession = Depends(get_session)
 ):
-    laptop: LaptopsTable = await insert_into(
+    laptop = await insert_into(
         session=session,
         table_schema=LaptopsTable,
         insert_data=insert_data
     )
 
-    return CreateLaptopResponse(
-        status=201,
-        message="Laptop created successfully",
-        data=LaptopData.from_orm(laptop)
+    return trusted_response(
+        CreateLaptopResponse(
+            status=201,
+            message="Laptop created successfully",
+            data=LaptopData.from_orm(laptop)
+        )
+    )
+
+
+# CREATE - many, from a JSON array or NDJSON body
+@router.post("/api/laptops/bulk", tags=["laptops"], response_model=BulkCreateResponse)
+async def create_laptops(
+    rows: list = Depends(get_bulk_rows),
+    session: AsyncSession = Depends(get_session)
+):
+    ids, errors = await bulk_insert(
+        session=session,
+        table_schema=LaptopsTable,
+        insert_schema=Laptop,
+        rows=rows
+    )
+
+    return trusted_response(
+        BulkCreateResponse(
+            status=201,
+            message=f"Laptops created: {len(rows) - len(errors)}, rejected: {len(errors)}",
+            data=ids,
+            errors=errors
+        )
     )
 
 
 # READ - all orders
-@router.get("/api/laptops", tags=["laptops"], response_model=StandardLaptopResponse)
-async def get_laptops(session: AsyncSession = Depends(get_session)):
-    laptops = await select_all(session=session, table_schema=LaptopsTable)
+@router.get(
+    "/api/laptops",
+    tags=["laptops"],
+    response_model=LaptopsExpandedResponse,
+    response_model_exclude_unset=True
+)
+async def get_laptops(
+    pagination: Pagination = Depends(get_pagination),
+    filters: list[Filter] = Depends(get_filters),
+    sorting: Sorting = Depends(get_sorting),
+    expand: list[str] = Depends(get_expand),
+    fields: list[str] = Depends(get_fields),
+    ids: list[str] = Depends(get_ids),
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_read_only_session)
+):
+    if ids:
+        laptops, missing_ids = await select_many(
+            session=session,
+            table_schema=LaptopsTable,
+            ids=ids,
+            expand=expand,
+            fields=fields,
+            filters=filters
+        )
+
+        return trusted_response(
+            LaptopsExpandedResponse(
+                status=200,
+                message="Laptops retrieved successfully",
+                data=[from_orm_loaded(LaptopExpandedData, laptop) for laptop in laptops],
+                missing_ids=missing_ids
+            ),
+            exclude_unset=True
+        )
 
-    return StandardLaptopResponse(
-        status=200,
-        message="Laptops retrieved successfully",
-        data=[LaptopData.from_orm(laptop) for laptop in laptops],
+    if stream:
+        return ndjson_response(
+            stream_all(
+                session=session,
+                table_schema=LaptopsTable,
+                expand=expand,
+                fields=fields,
+                filters=filters
+            ),
+            LaptopExpandedData
+        )
+
+    laptops, next_cursor = await select_page(
+        session=session,
+        table_schema=LaptopsTable,
+        limit=pagination.limit,
+        after=pagination.after,
+        order_by=sorting.column,
+        descending=sorting.descending,
+        expand=expand,
+        fields=fields,
+        filters=filters
+    )
+
+    return trusted_response(
+        LaptopsExpandedResponse(
+            status=200,
+            message="Laptops retrieved successfully",
+            data=[from_orm_loaded(LaptopExpandedData, laptop) for laptop in laptops],
+            next_cursor=next_cursor
+        ),
+        exclude_unset=True
     )
 
 
 # READ - specific order
-@router.get("/api/laptops/{laptop_id}", tags=["laptops"], response_model=StandardLaptopResponse)
+@router.get(
+    "/api/laptops/{laptop_id}",
+    tags=["laptops"],
+    response_model=LaptopsExpandedResponse,
+    response_model_exclude_unset=True
+)
 async def get_laptop(
     laptop_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    expand: list[str] = Depends(get_expand),
+    fields: list[str] = Depends(get_fields),
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     laptop: LaptopsTable = await select_specific(
         session=session,
         table_schema=LaptopsTable,
-        id=laptop_id
+        id=laptop_id,
+        expand=expand,
+        fields=fields
     )
 
-    return StandardLaptopResponse(
-        status=200,
-        message="Laptop retrieved successfully",
-        data=[LaptopData.from_orm(laptop)]
+    return trusted_response(
+        LaptopsExpandedResponse(
+            status=200,
+            message="Laptop retrieved successfully",
+            data=[from_orm_loaded(LaptopExpandedData, laptop)]
+        ),
+        exclude_unset=True
     )
 
 
@@ -90,24 +206,22 @@ async def update_laptop(
 ):
     update_data_dict = update_data.dict(exclude_none=True, exclude_unset=True)
 
-    laptop: LaptopsTable = await update_record(
+    if len(update_data_dict) == 0:
+        return empty_update_response()
+
+    laptop = await update_record(
         session=session,
         table_schema=LaptopsTable,
         id=laptop_id,
         update_data=update_data
     )
 
-    if len(update_data_dict) == 0:
-        return CreateLaptopResponse(
-            status=400,
-            message="No data to update, please check your data.",
+    return trusted_response(
+        CreateLaptopResponse(
+            status=200,
+            message="Laptop updated successfully",
             data=LaptopData.from_orm(laptop)
         )
-
-    return CreateLaptopResponse(
-        status=200,
-        message="Laptop updated successfully",
-        data=LaptopData.from_orm(laptop)
     )
 
 
@@ -123,9 +237,11 @@ async def delete_laptop(
         id=laptop_id
     )
 
-    return DeleteLaptopResponse(
-        status=200,
-        message="Laptop deleted successfully"
+    return trusted_response(
+        DeleteLaptopResponse(
+            status=200,
+            message="Laptop deleted successfully"
+        )
     )
 
 
@@ -154,13 +270,15 @@ async def add_component(
     )
     session.add(association)
 
-    await session.commit()
+    await session.flush()
     await session.refresh(laptop)
 
-    return LaptopComponentsResponse(
-        status=200,
-        message="Laptop's component created successfully",
-        data=LaptopComponentsData.from_orm(laptop),
+    return trusted_response(
+        LaptopComponentsResponse(
+            status=200,
+            message="Laptop's component created successfully",
+            data=LaptopComponentsData.from_orm(laptop),
+        )
     )
 
 
@@ -168,7 +286,7 @@ async def add_component(
 @router.get("/api/laptops/{laptop_id}/components", tags=["laptops"], response_model=LaptopComponentsResponse)
 async def get_laptop_components(
     laptop_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     laptop: LaptopsTable = await select_specific_extended(
         session=session,
@@ -177,8 +295,10 @@ async def get_laptop_components(
         attribute_name="components"
     )
 
-    return LaptopComponentsResponse(
-        status=200,
-        message="Laptop's components retrieved successfully",
-        data=LaptopComponentsData.from_orm(laptop),
+    return trusted_response(
+        LaptopComponentsResponse(
+            status=200,
+            message="Laptop's components retrieved successfully",
+            data=LaptopComponentsData.from_orm(laptop),
+        )
     )
@@ -1,9 +1,12 @@
-from typing import List
+from typing import List, Optional
+from uuid import UUID
 from app.modules.components.schemas import (
     ComponentData,
+    CreateComponentResponse,
     StandardComponentResponse
 )
 from app.modules.laptops.schemas import LaptopData, StandardLaptopResponse
+from app.modules.orders.schemas import OrderData
 
 
 class ComponentLaptopsData(ComponentData):
@@ -20,3 +23,39 @@ class LaptopComponentsData(LaptopData):
 
 class LaptopComponentsResponse(StandardLaptopResponse):
     data: LaptopComponentsData
+
+
+# Columns left out by ?fields= and relationships not requested through ?expand= stay unset
+class LaptopExpandedData(LaptopData):
+    laptop_id: Optional[UUID]
+    manufacturer: Optional[str]
+    model: Optional[str]
+    make_year: Optional[int]
+    components: Optional[List[ComponentData]]
+    orders: Optional[List[OrderData]]
+
+
+class ComponentExpandedData(ComponentData):
+    component_id: Optional[UUID]
+    type: Optional[str]
+    make_year: Optional[int]
+    laptops: Optional[List[LaptopData]]
+    orders: Optional[List[OrderData]]
+
+
+class LaptopsExpandedResponse(StandardLaptopResponse):
+    data: List[LaptopExpandedData]
+    next_cursor: Optional[str] = None
+    # ids requested through ?ids= that matched no record
+    missing_ids: Optional[List[UUID]] = None
+
+
+class ComponentsExpandedResponse(StandardComponentResponse):
+    data: List[ComponentExpandedData]
+    next_cursor: Optional[str] = None
+    # ids requested through ?ids= that matched no record
+    missing_ids: Optional[List[UUID]] = None
+
+
+class ComponentExpandedResponse(CreateComponentResponse):
+    data: ComponentExpandedData
@@ -0,0 +1,45 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.db.pool import WAIT_TIME_BUCKETS, pool_status
+from app.db.session import named_engines
+
+router = APIRouter()
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+POOL_GAUGES = (
+    ("size", "gauge", "Connections kept open by the pool."),
+    ("checked_out", "gauge", "Connections currently checked out."),
+    ("checked_in", "gauge", "Idle connections in the pool."),
+    ("overflow", "gauge", "Connections opened above the pool size."),
+    ("pre_ping_failures", "counter", "Stale connections detected by pre-ping."),
+)
+
+
+@router.get("/api/metrics", tags=["metrics"], response_class=PlainTextResponse)
+async def metrics():
+    """Connection pool metrics in the Prometheus text exposition format, one series per pool."""
+    pools = {name: engine.pool for name, engine in named_engines().items()}
+    statuses = {name: pool_status(pool) for name, pool in pools.items()}
+    lines = []
+
+    for name, kind, help_text in POOL_GAUGES:
+        metric = f"db_pool_{name}" + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{pool="{pool}"}} {status[name]}' for pool, status in statuses.items()]
+
+    lines += [
+        "# HELP db_pool_wait_seconds Time spent waiting for a connection on checkout.",
+        "# TYPE db_pool_wait_seconds histogram",
+    ]
+    for name, pool in pools.items():
+        cumulative = 0
+        for bound, count in zip((*WAIT_TIME_BUCKETS, "+Inf"), pool.stats.wait_time_counts):
+            cumulative += count
+            lines.append(f'db_pool_wait_seconds_bucket{{pool="{name}",le="{bound}"}} {cumulative}')
+        lines += [
+            f'db_pool_wait_seconds_sum{{pool="{name}"}} {statuses[name]["wait_time_seconds_sum"]}',
+            f'db_pool_wait_seconds_count{{pool="{name}"}} {statuses[name]["checkouts"]}',
+        ]
+
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_MEDIA_TYPE)
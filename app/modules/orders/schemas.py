@@ -6,13 +6,19 @@ from pydantic import BaseModel
 from app.modules.components.schemas import ComponentData
 from app.modules.customers.schemas import (
     CustomerData,
-    StandardCustomerResponse
+    StandardCustomerResponse,
+    StandardCustomersResponse
 )
+from app.modules.laptop_component.schemas import ComponentOrderData
+from app.modules.laptop_order.schemas import LaptopOrderData
 from app.modules.laptops.schemas import LaptopData
 
 from app.modules.shipments.schemas import (
+    PatchShipment,
     ShipmentData,
-    StandardShipmentResponse
+    Status as ShipmentStatus,
+    StandardShipmentResponse,
+    StandardShipmentsResponse
 )
 
 
@@ -45,6 +51,27 @@ class OrderData(Order):
     customer_id: UUID
 
 
+# Order header and its line items, placed with a single request
+class CheckoutLaptopLine(BaseModel):
+    laptop_id: UUID
+    quantity: int
+
+
+class CheckoutComponentLine(BaseModel):
+    component_id: UUID
+    quantity: int
+
+
+class CheckoutOrder(InsertOrder):
+    laptop_orders: List[CheckoutLaptopLine] = []
+    component_orders: List[CheckoutComponentLine] = []
+
+
+class CheckoutOrderData(OrderData):
+    laptop_orders: List[LaptopOrderData]
+    component_orders: List[ComponentOrderData]
+
+
 class ShipmentOrdersData(ShipmentData):
     orders: List[OrderData]
 
@@ -70,6 +97,56 @@ class OrderComponentsData(OrderData):
     components: List[ComponentData]
 
 
+# Shipment values applied to many shipments at once, optionally moving their orders along
+class BulkPatchShipment(PatchShipment):
+    order_status: Optional[Status]
+
+
+# Order document of /api/orders/{order_id}/full, line items carry the ordered quantity
+class OrderLaptopLineData(LaptopData):
+    laptop_order_id: UUID
+    quantity: int
+
+
+class OrderComponentLineData(ComponentData):
+    component_order_id: UUID
+    quantity: int
+
+
+class OrderDocumentData(OrderData):
+    customer: CustomerData
+    shipment: Optional[ShipmentData]
+    laptops: List[OrderLaptopLineData]
+    components: List[OrderComponentLineData]
+
+
+# Columns left out by ?fields= and relationships not requested through ?expand= stay unset
+class OrderExpandedData(OrderData):
+    order_id: Optional[UUID]
+    order_date: Optional[datetime.date]
+    order_status: Optional[Status]
+    customer_id: Optional[UUID]
+    customer: Optional[CustomerData]
+    shipment: Optional[ShipmentData]
+    laptops: Optional[List[LaptopData]]
+    components: Optional[List[ComponentData]]
+
+
+class CustomerExpandedData(CustomerData):
+    customer_id: Optional[UUID]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    orders: Optional[List[OrderData]]
+
+
+class ShipmentExpandedData(ShipmentData):
+    shipment_id: Optional[UUID]
+    shipment_date: Optional[datetime.date]
+    shipment_status: Optional[ShipmentStatus]
+    shipment_address: Optional[str]
+    orders: Optional[List[OrderData]]
+
+
 # Data validation for response
 class StandardOrdersResponse(BaseModel):
     status: int
@@ -83,6 +160,25 @@ class StandardOrderResponse(BaseModel):
     data: OrderData
 
 
+class OrdersExpandedResponse(StandardOrdersResponse):
+    data: List[OrderExpandedData]
+    next_cursor: Optional[str] = None
+    # ids requested through ?ids= that matched no record
+    missing_ids: Optional[List[UUID]] = None
+
+
+class CheckoutOrderResponse(StandardOrderResponse):
+    data: CheckoutOrderData
+
+
+class OrderDocumentResponse(StandardOrderResponse):
+    data: OrderDocumentData
+
+
+class OrderExpandedResponse(StandardOrderResponse):
+    data: OrderExpandedData
+
+
 class ShipmentsOrdersResponse(StandardShipmentResponse):
     data: List[ShipmentOrdersData]
 
@@ -131,6 +227,33 @@ class CustomerOrdersResponse(StandardCustomerResponse):
     data: CustomerOrdersData
 
 
+class CustomersExpandedResponse(StandardCustomersResponse):
+    data: List[CustomerExpandedData]
+    next_cursor: Optional[str] = None
+    # ids requested through ?ids= that matched no record
+    missing_ids: Optional[List[UUID]] = None
+
+
+class CustomerExpandedResponse(StandardCustomerResponse):
+    data: CustomerExpandedData
+
+
+class ShipmentsExpandedResponse(StandardShipmentsResponse):
+    data: List[ShipmentExpandedData]
+    next_cursor: Optional[str] = None
+    # ids requested through ?ids= that matched no record
+    missing_ids: Optional[List[UUID]] = None
+
+
+class ShipmentExpandedResponse(StandardShipmentResponse):
+    data: ShipmentExpandedData
+
+
+class BulkPatchShipmentsResponse(StandardShipmentsResponse):
+    # orders whose status was changed along with their shipment
+    orders_updated: List[UUID]
+
+
 class DeleteOrderResponse(BaseModel):
     status: int
     message: Optional[str]
@@ -1,7 +1,27 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.base.dependencies.db import get_session
+from app.base.dependencies.bulk import get_bulk_rows
+from app.base.dependencies.db import (
+    get_bulk_read_only_session,
+    get_read_only_session,
+    get_session
+)
+from app.base.dependencies.expand import get_expand
+from app.base.dependencies.fields import get_fields
+from app.base.dependencies.filters import Filter, Sorting, get_filters, get_sorting
+from app.base.dependencies.ids import get_ids
+from app.base.dependencies.pagination import Pagination, get_pagination
+from app.base.dependencies.streaming import is_stream_requested
+from app.base.responses import (
+    empty_update_response,
+    from_orm_loaded,
+    json_document_response,
+    ndjson_response,
+    trusted_response
+)
+from app.base.routing import UnitOfWorkRoute
+from app.base.schemas import BulkCreateResponse
 from app.db.models.component_order import ComponentOrderTable
 from app.db.models.laptop_order import LaptopOrderTable
 from app.db.models.orders import OrdersTable
@@ -17,6 +37,9 @@ from app.modules.laptop_order.schemas import (
     LaptopOrderResponse
 )
 from app.modules.orders.schemas import (
+    CheckoutOrder,
+    CheckoutOrderData,
+    CheckoutOrderResponse,
     DeleteOrderResponse,
     InsertOrder,
     OrderComponentsData,
@@ -25,7 +48,11 @@ from app.modules.orders.schemas import (
     OrderCustomerResponse,
     OrdersComponentsResponse,
     OrdersCustomerResponse,
+    OrdersExpandedResponse,
     OrderData,
+    OrderDocumentResponse,
+    OrderExpandedData,
+    OrderExpandedResponse,
     OrderLaptopsData,
     OrderLaptopsResponse,
     OrderShipmentData,
@@ -33,21 +60,28 @@ from app.modules.orders.schemas import (
     OrdersLaptopsResponse,
     OrdersShipmentResponse,
     PatchOrder,
-    StandardOrdersResponse,
-    StandardOrderResponse
+    StandardOrderResponse,
+    StandardOrdersResponse
 )
 from app.modules.servicer import (
+    bulk_insert,
     delete_record,
     insert_into,
-    select_all,
+    insert_many,
     select_all_extended,
+    select_all_extended_json,
+    select_many,
+    select_order_document,
+    select_page,
     select_specific,
     select_specific_extended,
+    stream_all,
+    update_many,
     update_record
 )
 
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 # CREATE
@@ -56,16 +90,41 @@ async def create_order(
     order_data: InsertOrder,
     session: AsyncSession = Depends(get_session)
 ):
-    order: OrdersTable = await insert_into(
+    order = await insert_into(
         session=session,
         table_schema=OrdersTable,
         insert_data=order_data
     )
 
-    return StandardOrderResponse(
-        status=201,
-        message="Order created successfully",
-        data=OrderData.from_orm(order)
+    return trusted_response(
+        StandardOrderResponse(
+            status=201,
+            message="Order created successfully",
+            data=OrderData.from_orm(order)
+        )
+    )
+
+
+# CREATE - many, from a JSON array or NDJSON body
+@router.post("/api/orders/bulk", tags=["orders"], response_model=BulkCreateResponse)
+async def create_orders(
+    rows: list = Depends(get_bulk_rows),
+    session: AsyncSession = Depends(get_session)
+):
+    ids, errors = await bulk_insert(
+        session=session,
+        table_schema=OrdersTable,
+        insert_schema=InsertOrder,
+        rows=rows
+    )
+
+    return trusted_response(
+        BulkCreateResponse(
+            status=201,
+            message=f"Orders created: {len(rows) - len(errors)}, rejected: {len(errors)}",
+            data=ids,
+            errors=errors
+        )
     )
 
 
@@ -75,16 +134,41 @@ async def add_laptop_to_order(
     laptop_order_data: LaptopOrder,
     session: AsyncSession = Depends(get_session)
 ):
-    laptop_order: LaptopOrderTable = await insert_into(
+    laptop_order = await insert_into(
         session=session,
         table_schema=LaptopOrderTable,
         insert_data=laptop_order_data
     )
 
-    return LaptopOrderResponse(
-        status=201,
-        message="Laptop order created successfully",
-        data=LaptopOrderData.from_orm(laptop_order)
+    return trusted_response(
+        LaptopOrderResponse(
+            status=201,
+            message="Laptop order created successfully",
+            data=LaptopOrderData.from_orm(laptop_order)
+        )
+    )
+
+
+# CREATE - many, from a JSON array or NDJSON body
+@router.post("/api/orders/laptop/bulk", tags=["orders"], response_model=BulkCreateResponse)
+async def add_laptops_to_orders(
+    rows: list = Depends(get_bulk_rows),
+    session: AsyncSession = Depends(get_session)
+):
+    ids, errors = await bulk_insert(
+        session=session,
+        table_schema=LaptopOrderTable,
+        insert_schema=LaptopOrder,
+        rows=rows
+    )
+
+    return trusted_response(
+        BulkCreateResponse(
+            status=201,
+            message=f"Laptop orders created: {len(rows) - len(errors)}, rejected: {len(errors)}",
+            data=ids,
+            errors=errors
+        )
     )
 
 
@@ -94,132 +178,313 @@ async def add_component_to_order(
     component_order_data: ComponentOrder,
     session: AsyncSession = Depends(get_session)
 ):
-    laptop_order: ComponentOrderTable = await insert_into(
+    laptop_order = await insert_into(
         session=session,
         table_schema=ComponentOrderTable,
         insert_data=component_order_data
     )
 
-    return ComponentOrderResponse(
-        status=201,
-        message="Component order created successfully",
-        data=[ComponentOrderData.from_orm(laptop_order)]
+    return trusted_response(
+        ComponentOrderResponse(
+            status=201,
+            message="Component order created successfully",
+            data=[ComponentOrderData.from_orm(laptop_order)]
+        )
+    )
+
+
+# CREATE - many, from a JSON array or NDJSON body
+@router.post("/api/orders/component/bulk", tags=["orders"], response_model=BulkCreateResponse)
+async def add_components_to_orders(
+    rows: list = Depends(get_bulk_rows),
+    session: AsyncSession = Depends(get_session)
+):
+    ids, errors = await bulk_insert(
+        session=session,
+        table_schema=ComponentOrderTable,
+        insert_schema=ComponentOrder,
+        rows=rows
+    )
+
+    return trusted_response(
+        BulkCreateResponse(
+            status=201,
+            message=f"Component orders created: {len(rows) - len(errors)}, rejected: {len(errors)}",
+            data=ids,
+            errors=errors
+        )
+    )
+
+
+# CREATE - order with its laptops and components, in one transaction
+@router.post("/api/orders/checkout", tags=["orders"], response_model=CheckoutOrderResponse)
+async def checkout_order(
+    checkout_data: CheckoutOrder,
+    session: AsyncSession = Depends(get_session)
+):
+    order = await insert_into(
+        session=session,
+        table_schema=OrdersTable,
+        insert_data=InsertOrder(
+            **checkout_data.dict(exclude={"laptop_orders", "component_orders"}, exclude_unset=True)
+        )
+    )
+    # one multi-row INSERT per line table; an unknown laptop or component rolls back the order
+    laptop_orders = await insert_many(
+        session=session,
+        table_schema=LaptopOrderTable,
+        insert_data=[
+            {"order_id": order.order_id, **line.dict()} for line in checkout_data.laptop_orders
+        ]
+    )
+    component_orders = await insert_many(
+        session=session,
+        table_schema=ComponentOrderTable,
+        insert_data=[
+            {"order_id": order.order_id, **line.dict()} for line in checkout_data.component_orders
+        ]
+    )
+
+    return trusted_response(
+        CheckoutOrderResponse(
+            status=201,
+            message="Order created successfully",
+            data=CheckoutOrderData(
+                **OrderData.from_orm(order).dict(),
+                laptop_orders=[LaptopOrderData.from_orm(line) for line in laptop_orders],
+                component_orders=[ComponentOrderData.from_orm(line) for line in component_orders]
+            )
+        )
     )
 
 
 # READ - all orders
-@router.get("/api/orders", tags=["orders"], response_model=StandardOrdersResponse)
+@router.get(
+    "/api/orders",
+    tags=["orders"],
+    response_model=OrdersExpandedResponse,
+    response_model_exclude_unset=True
+)
 async def get_orders(
-    session: AsyncSession = Depends(get_session)
+    pagination: Pagination = Depends(get_pagination),
+    filters: list[Filter] = Depends(get_filters),
+    sorting: Sorting = Depends(get_sorting),
+    expand: list[str] = Depends(get_expand),
+    fields: list[str] = Depends(get_fields),
+    ids: list[str] = Depends(get_ids),
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_read_only_session)
 ):
-    orders: list[OrdersTable] = await select_all(
+    if ids:
+        orders, missing_ids = await select_many(
+            session=session,
+            table_schema=OrdersTable,
+            ids=ids,
+            expand=expand,
+            fields=fields,
+            filters=filters
+        )
+
+        return trusted_response(
+            OrdersExpandedResponse(
+                status=200,
+                message="Orders sucessfully retrieved",
+                data=[from_orm_loaded(OrderExpandedData, order) for order in orders],
+                missing_ids=missing_ids
+            ),
+            exclude_unset=True
+        )
+
+    if stream:
+        return ndjson_response(
+            stream_all(
+                session=session,
+                table_schema=OrdersTable,
+                expand=expand,
+                fields=fields,
+                filters=filters
+            ),
+            OrderExpandedData
+        )
+
+    orders, next_cursor = await select_page(
         session=session,
-        table_schema=OrdersTable
+        table_schema=OrdersTable,
+        limit=pagination.limit,
+        after=pagination.after,
+        order_by=sorting.column,
+        descending=sorting.descending,
+        expand=expand,
+        fields=fields,
+        filters=filters
     )
 
-    return StandardOrdersResponse(
-        status=200,
-        message="Orders sucessfully retrieved",
-        data=[OrderData.from_orm(order) for order in orders]
+    return trusted_response(
+        OrdersExpandedResponse(
+            status=200,
+            message="Orders sucessfully retrieved",
+            data=[from_orm_loaded(OrderExpandedData, order) for order in orders],
+            next_cursor=next_cursor
+        ),
+        exclude_unset=True
     )
 
 
 # READ - orders' customers
 @router.get("/api/orders/customer", tags=['orders'], response_model=OrdersCustomerResponse)
 async def get_orders_customer(
-    session: AsyncSession = Depends(get_session)
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_bulk_read_only_session)
 ):
+    if stream:
+        return ndjson_response(
+            stream_all(session=session, table_schema=OrdersTable, expand=["customer"]),
+            OrderCustomerData
+        )
+
     orders: list[OrdersTable] = await select_all_extended(
         session=session,
         table_schema=OrdersTable,
         attribute_name="customer"
     )
 
-    return OrdersCustomerResponse(
-        status=200,
-        message="Orders sucessfully retrieved",
-        data=[OrderCustomerData.from_orm(order) for order in orders]
+    return trusted_response(
+        OrdersCustomerResponse(
+            status=200,
+            message="Orders sucessfully retrieved",
+            data=[OrderCustomerData.from_orm(order) for order in orders]
+        )
     )
 
 
 # READ - orders' shipments
 @router.get("/api/orders/shipment", tags=['orders'], response_model=OrdersShipmentResponse)
 async def get_orders_shipment(
-    session: AsyncSession = Depends(get_session)
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_bulk_read_only_session)
 ):
+    if stream:
+        return ndjson_response(
+            stream_all(session=session, table_schema=OrdersTable, expand=["shipment"]),
+            OrderShipmentData
+        )
+
     orders: list[OrdersTable] = await select_all_extended(
         session=session,
         table_schema=OrdersTable,
         attribute_name="shipment"
     )
 
-    return OrdersShipmentResponse(
-        status=200,
-        message="Orders sucessfully retrieved",
-        data=[OrderShipmentData.from_orm(order) for order in orders]
+    return trusted_response(
+        OrdersShipmentResponse(
+            status=200,
+            message="Orders sucessfully retrieved",
+            data=[OrderShipmentData.from_orm(order) for order in orders]
+        )
     )
 
 
 # READ - orders' laptops
 @router.get("/api/orders/laptops", tags=['orders'], response_model=OrdersLaptopsResponse)
 async def get_orders_laptops(
-    session: AsyncSession = Depends(get_session)
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_bulk_read_only_session)
 ):
-    orders: list[OrdersTable] = await select_all_extended(
+    if stream:
+        return ndjson_response(
+            stream_all(session=session, table_schema=OrdersTable, expand=["laptops"]),
+            OrderLaptopsData
+        )
+
+    # the JSON is written by Postgres and passed through as is
+    orders = await select_all_extended_json(
         session=session,
         table_schema=OrdersTable,
-        attribute_name="laptops"
+        attribute_name="laptops",
+        schema=OrderLaptopsData
     )
 
-    return OrdersLaptopsResponse(
+    return json_document_response(
         status=200,
         message="Orders sucessfully retrieved",
-        data=[OrderLaptopsData.from_orm(order) for order in orders]
+        data=f"[{','.join(orders)}]"
     )
 
 
 # READ - orders' components
 @router.get("/api/orders/components", tags=['orders'], response_model=OrdersComponentsResponse)
 async def get_orders_components(
-    session: AsyncSession = Depends(get_session)
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_bulk_read_only_session)
 ):
-    orders: list[OrdersTable] = await select_all_extended(
+    if stream:
+        return ndjson_response(
+            stream_all(session=session, table_schema=OrdersTable, expand=["components"]),
+            OrderComponentsData
+        )
+
+    # the JSON is written by Postgres and passed through as is
+    orders = await select_all_extended_json(
         session=session,
         table_schema=OrdersTable,
-        attribute_name="components"
+        attribute_name="components",
+        schema=OrderComponentsData
     )
 
-    return OrdersComponentsResponse(
+    return json_document_response(
         status=200,
         message="Orders sucessfully retrieved",
-        data=[OrderComponentsData.from_orm(order) for order in orders]
+        data=f"[{','.join(orders)}]"
     )
 
 
 # READ - specific order
-@router.get("/api/orders/{order_id}", tags=["orders"], response_model=StandardOrderResponse)
+@router.get(
+    "/api/orders/{order_id}",
+    tags=["orders"],
+    response_model=OrderExpandedResponse,
+    response_model_exclude_unset=True
+)
 async def get_order(
     order_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    expand: list[str] = Depends(get_expand),
+    fields: list[str] = Depends(get_fields),
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     order: OrdersTable = await select_specific(
         session=session,
         table_schema=OrdersTable,
-        id=order_id
+        id=order_id,
+        expand=expand,
+        fields=fields
     )
 
-    return StandardOrderResponse(
-        status=200,
-        message="Order sucessfully retrieved",
-        data=OrderData.from_orm(order)
+    return trusted_response(
+        OrderExpandedResponse(
+            status=200,
+            message="Order sucessfully retrieved",
+            data=from_orm_loaded(OrderExpandedData, order)
+        ),
+        exclude_unset=True
     )
 
 
+# READ - specific order with customer, shipment and line items, as one JSON document
+@router.get("/api/orders/{order_id}/full", tags=['orders'], response_model=OrderDocumentResponse)
+async def get_order_full(
+    order_id: UUID,
+    session: AsyncSession = Depends(get_read_only_session)
+):
+    order = await select_order_document(session=session, order_id=order_id)
+
+    return json_document_response(status=200, message="Order sucessfully retrieved", data=order)
+
+
 # READ - specific order's customer
 @router.get("/api/orders/{order_id}/customer", tags=['orders'], response_model=OrderCustomerResponse)
 async def get_order_customer(
     order_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     order: OrdersTable = await select_specific_extended(
         session=session,
@@ -228,10 +493,12 @@ async def get_order_customer(
         attribute_name="customer"
     )
 
-    return OrderCustomerResponse(
-        status=200,
-        message="Order sucessfully retrieved",
-        data=OrderCustomerData.from_orm(order)
+    return trusted_response(
+        OrderCustomerResponse(
+            status=200,
+            message="Order sucessfully retrieved",
+            data=OrderCustomerData.from_orm(order)
+        )
     )
 
 
@@ -239,7 +506,7 @@ async def get_order_customer(
 @router.get("/api/orders/{order_id}/shipment", tags=['orders'], response_model=OrderShipmentResponse)
 async def get_order_shipment(
     order_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     order: OrdersTable = await select_specific_extended(
         session=session,
@@ -248,10 +515,12 @@ async def get_order_shipment(
         attribute_name="shipment"
     )
 
-    return OrderShipmentResponse(
-        status=200,
-        message="Order sucessfully retrieved",
-        data=OrderShipmentData.from_orm(order)
+    return trusted_response(
+        OrderShipmentResponse(
+            status=200,
+            message="Order sucessfully retrieved",
+            data=OrderShipmentData.from_orm(order)
+        )
     )
 
 
@@ -259,7 +528,7 @@ async def get_order_shipment(
 @router.get("/api/orders/{order_id}/laptops", tags=['orders'], response_model=OrderLaptopsResponse)
 async def get_order_laptops(
     order_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     order: OrdersTable = await select_specific_extended(
         session=session,
@@ -268,10 +537,12 @@ async def get_order_laptops(
         attribute_name="laptops"
     )
 
-    return OrderLaptopsResponse(
-        status=200,
-        message="Order sucessfully retrieved",
-        data=OrderLaptopsData.from_orm(order)
+    return trusted_response(
+        OrderLaptopsResponse(
+            status=200,
+            message="Order sucessfully retrieved",
+            data=OrderLaptopsData.from_orm(order)
+        )
     )
 
 
@@ -279,7 +550,7 @@ async def get_order_laptops(
 @router.get("/api/orders/{order_id}/components", tags=['orders'], response_model=OrderComponentsResponse)
 async def get_order_components(
     order_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     order: OrdersTable = await select_specific_extended(
         session=session,
@@ -288,10 +559,12 @@ async def get_order_components(
         attribute_name="components"
     )
 
-    return OrderComponentsResponse(
-        status=200,
-        message="Order sucessfully retrieved",
-        data=OrderComponentsData.from_orm(order)
+    return trusted_response(
+        OrderComponentsResponse(
+            status=200,
+            message="Order sucessfully retrieved",
+            data=OrderComponentsData.from_orm(order)
+        )
     )
 
 
@@ -304,24 +577,52 @@ async def update_order(
 ):
     update_data_dict = update_data.dict(exclude_none=True, exclude_unset=True)
 
-    order: OrdersTable = await update_record(
+    if len(update_data_dict) == 0:
+        return empty_update_response()
+
+    order = await update_record(
         session=session,
         table_schema=OrdersTable,
         id=order_id,
         update_data=update_data
     )
 
-    if len(update_data_dict) == 0:
-        return StandardOrderResponse(
-            status=400,
-            message="No data to update, please check your data.",
+    return trusted_response(
+        StandardOrderResponse(
+            status=200,
+            message="Order updated successfully",
             data=OrderData.from_orm(order)
         )
+    )
 
-    return StandardOrderResponse(
-        status=200,
-        message="Order updated successfully",
-        data=OrderData.from_orm(order)
+
+# UPDATE - many, selected by ?ids= and/or filters, e.g. ?order_status=pending
+@router.patch("/api/orders", tags=['orders'], response_model=StandardOrdersResponse)
+async def update_orders(
+    update_data: PatchOrder,
+    ids: list[str] = Depends(get_ids),
+    filters: list[Filter] = Depends(get_filters),
+    session: AsyncSession = Depends(get_session)
+):
+    update_data_dict = update_data.dict(exclude_none=True, exclude_unset=True)
+
+    if len(update_data_dict) == 0:
+        return empty_update_response()
+
+    orders = await update_many(
+        session=session,
+        table_schema=OrdersTable,
+        update_data=update_data,
+        ids=ids,
+        filters=filters
+    )
+
+    return trusted_response(
+        StandardOrdersResponse(
+            status=200,
+            message="Orders updated successfully",
+            data=[OrderData.from_orm(order) for order in orders]
+        )
     )
 
 
@@ -337,7 +638,9 @@ async def delete_order(
         id=order_id
     )
 
-    return DeleteOrderResponse(
-        status=200,
-        message="Order deleted successfully"
+    return trusted_response(
+        DeleteOrderResponse(
+            status=200,
+            message="Order deleted successfully"
+        )
     )
@@ -1,19 +1,319 @@
+import base64
+import binascii
+import json
+import operator
+from enum import Enum
+from typing import Any, AsyncIterator, Optional, Sequence
 from uuid import UUID
-from pydantic import BaseModel
-from sqlalchemy import inspect, select
+import asyncpg
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Result,
+    Row,
+    Select,
+    Text,
+    any_,
+    cast,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.base.constants import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, STREAM_CHUNK_SIZE
+from app.base.dependencies.filters import Filter
+from app.base.exceptions import InvalidQueryError
 from app.db.base import Base
-from sqlalchemy.orm import selectinload
+from app.db.keys import uuid7
+from app.db.models.component_order import ComponentOrderTable
+from app.db.models.components import ComponentsTable
+from app.db.models.customers import CustomersTable
+from app.db.models.laptop_order import LaptopOrderTable
+from app.db.models.laptops import LaptopsTable
+from app.db.models.orders import OrdersTable
+from app.db.models.shipments import ShipmentsTable
+from app.modules.customers.schemas import CustomerData
+from app.modules.orders.schemas import (
+    OrderComponentLineData,
+    OrderDocumentData,
+    OrderLaptopLineData
+)
+from app.modules.shipments.schemas import ShipmentData
+from sqlalchemy.orm import InstrumentedAttribute, joinedload, load_only, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 
 
-# Equivalent to SELECT * FROM table;
-async def select_all(session: AsyncSession, table_schema: Base) -> list:
-    query = select(table_schema)
+FILTER_OPERATORS = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda column, values: column.in_(values),
+}
+
+
+def _expand_options(table_schema: Base, expand: Sequence[str]) -> list[LoaderOption]:
+    """
+    Many-to-one relationships are joined into the main query, collections are fetched
+    with one additional SELECT ... WHERE fk IN (...) per relationship.
+    """
+    relationships = inspect(table_schema).relationships
+    options = []
+
+    for name in dict.fromkeys(expand):
+        relationship = relationships.get(name)
+        if relationship is None:
+            raise InvalidQueryError(
+                f"{name} is not a valid relationship in {table_schema.__name__}"
+            )
+
+        attribute = getattr(table_schema, name)
+        options.append(selectinload(attribute) if relationship.uselist else joinedload(attribute))
+
+    return options
+
+
+def _validate_fields(table_schema: Base, fields: Sequence[str]) -> None:
+    columns = table_schema.__table__.columns
+    for name in fields:
+        if name not in columns:
+            raise InvalidQueryError(f"{name} is not a valid column in {table_schema.__name__}")
+
+
+def _fields_options(table_schema: Base, fields: Sequence[str]) -> list[LoaderOption]:
+    """
+    Narrows the SELECT column list to `fields`; the primary key is always loaded.
+    """
+    if not fields:
+        return []
+
+    _validate_fields(table_schema, fields)
+
+    return [load_only(*[getattr(table_schema, name) for name in dict.fromkeys(fields)])]
+
+
+def _columns(table_schema: Base, fields: Sequence[str]) -> list[InstrumentedAttribute]:
+    """
+    Column attributes of `table_schema`, narrowed to the primary key and `fields` if given.
+    """
+    if not fields:
+        return [attribute.class_attribute for attribute in inspect(table_schema).column_attrs]
+
+    _validate_fields(table_schema, fields)
+
+    table_id = inspect(table_schema).primary_key[0]
+    return [getattr(table_schema, name) for name in dict.fromkeys([table_id.key, *fields])]
+
+
+def _select(table_schema: Base, expand: Sequence[str], fields: Sequence[str]) -> Select:
+    """
+    Without `expand` the columns are selected as plain rows, so no mapped instances are built,
+    registered in the identity map and tracked for a read that only copies them into a
+    response; relationships can only be loaded onto mapped instances.
+    """
+    if not expand:
+        return select(*_columns(table_schema, fields))
+
+    return select(table_schema).options(
+        *_expand_options(table_schema, expand), *_fields_options(table_schema, fields)
+    )
+
+
+def _rows(result: Result, expand: Sequence[str]) -> Sequence[Any]:
+    """Mapped instances when `expand` was given to `_select`, plain rows otherwise."""
+    return result.scalars().all() if expand else result.all()
+
+
+def _indexed_columns(table_schema: Base) -> set[str]:
+    """Columns that lead an index of the table and therefore can be filtered and sorted on."""
+    table = table_schema.__table__
+    columns = {column.name for column in table.primary_key.columns}
+    columns.update(next(iter(index.columns)).name for index in table.indexes)
+
+    return columns
+
+
+def _filter_criteria(table_schema: Base, filters: Sequence[Filter]) -> list[ColumnElement]:
+    """
+    Compiles the filters into bound parameter comparisons; only index backed columns are
+    accepted, so every filter stays an index scan.
+    """
+    indexed = _indexed_columns(table_schema)
+    criteria = []
+
+    for item in filters:
+        column = table_schema.__table__.columns.get(item.column)
+        if column is None or item.column not in indexed:
+            raise InvalidQueryError(f"{item.column} can not be filtered in {table_schema.__name__}")
+
+        compare = FILTER_OPERATORS.get(item.operator)
+        if compare is None:
+            raise InvalidQueryError(f"{item.operator} is not a valid filter operator")
+
+        try:
+            if item.operator == "in":
+                value = [_parse_value(column, value) for value in item.value.split(",")]
+            else:
+                value = _parse_value(column, item.value)
+        except ValueError as exc:
+            raise InvalidQueryError(f"Invalid value for {item.column}: {exc}") from exc
+
+        criteria.append(compare(column, value))
+
+    return criteria
+
+
+def _sort_column(table_schema: Base, order_by: Optional[str]) -> Column:
+    if order_by is None:
+        return inspect(table_schema).primary_key[0]
+
+    column = table_schema.__table__.columns.get(order_by)
+    if column is None or order_by not in _indexed_columns(table_schema):
+        raise InvalidQueryError(f"{order_by} can not be sorted on in {table_schema.__name__}")
+    if column.nullable:
+        # NULLs break the (sort, pk) row comparison used for keyset pagination
+        raise InvalidQueryError(f"{order_by} is nullable and can not be used for sorting")
+
+    return column
+
+
+def _encode_value(value: Any) -> Any:
+    """Cursor value as JSON that `_parse_value` turns back into the column's value."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (bool, int, float)):
+        return value
+    return str(value)
+
+
+def _encode_cursor(sort_key: str, values: tuple) -> str:
+    payload = json.dumps([sort_key, *[_encode_value(value) for value in values]])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _parse_value(column: Column, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is bool and isinstance(value, str):
+        if value.lower() not in ("true", "false"):
+            raise ValueError(f"{value} is not a boolean")
+        return value.lower() == "true"
+    if hasattr(python_type, "fromisoformat"):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def _decode_cursor(cursor: str, sort_key: str, columns: tuple[Column, ...]) -> tuple:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        cursor_key, *values = payload
+        if cursor_key != sort_key or len(values) != len(columns):
+            raise ValueError("cursor does not match the requested sorting")
+        return tuple(_parse_value(column, value) for column, value in zip(columns, values))
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise InvalidQueryError(f"Invalid cursor: {exc}") from exc
+
+
+# Keyset pagination: SELECT * FROM table WHERE (sort, pk) > (:sort, :pk) ORDER BY sort, pk LIMIT n;
+async def select_page(
+    session: AsyncSession,
+    table_schema: Base,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after: Optional[str] = None,
+    order_by: Optional[str] = None,
+    descending: bool = False,
+    expand: Sequence[str] = (),
+    fields: Sequence[str] = (),
+    filters: Sequence[Filter] = (),
+) -> tuple[list, Optional[str]]:
+    """
+    Returns at most `limit` rows ordered by `order_by` (primary key by default) together with
+    the cursor of the next page, or None when the last page was reached.
+    The primary key is always appended to the sort key, so the ordering is total and no
+    OFFSET scan is ever needed.
+    """
+    table_id = inspect(table_schema).primary_key[0]
+    sort_column = _sort_column(table_schema, order_by)
+    columns = (sort_column,) if sort_column is table_id else (sort_column, table_id)
+    sort_key = f"-{sort_column.name}" if descending else sort_column.name
+
+    if fields:
+        # the cursor is built from the sort column, so it has to be loaded
+        fields = [*fields, sort_column.key]
+
+    query = (
+        _select(table_schema, expand, fields)
+        .where(*_filter_criteria(table_schema, filters))
+        .order_by(*[column.desc() if descending else column.asc() for column in columns])
+    )
+
+    if after is not None:
+        values = _decode_cursor(after, sort_key, columns)
+        key = tuple_(*columns)
+        bound = tuple_(*[literal(value, column.type) for column, value in zip(columns, values)])
+        query = query.where(key < bound if descending else key > bound)
+
+    response = await session.execute(query.limit(limit + 1))
+    results = _rows(response, expand)
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        next_cursor = _encode_cursor(
+            sort_key, tuple(getattr(last, column.key) for column in columns)
+        )
+
+    return results, next_cursor
+
+
+# Equivalent to SELECT * FROM table WHERE pk = ANY(:ids);
+async def select_many(
+    session: AsyncSession,
+    table_schema: Base,
+    ids: Sequence[str],
+    expand: Sequence[str] = (),
+    fields: Sequence[str] = (),
+    filters: Sequence[Filter] = (),
+) -> tuple[list, list]:
+    """
+    Fetches the rows of `ids` in a single query and returns them in the requested order,
+    together with the ids that matched no row. The ids are bound as one array parameter,
+    so the statement text is the same for any number of ids and its prepared statement
+    is reused.
+    """
+    table_id = inspect(table_schema).primary_key[0]
+
+    if len(ids) > MAX_PAGE_LIMIT:
+        raise InvalidQueryError(f"At most {MAX_PAGE_LIMIT} ids can be fetched at once")
+    try:
+        ids = list(dict.fromkeys(_parse_value(table_id, value) for value in ids))
+    except ValueError as exc:
+        raise InvalidQueryError(f"Invalid id: {exc}") from exc
+
+    query = (
+        _select(table_schema, expand, fields)
+        .where(table_id == any_(literal(ids, ARRAY(table_id.type))))
+        .where(*_filter_criteria(table_schema, filters))
+    )
+
     response = await session.execute(query)
-    results = response.scalars().all()
+    found = {getattr(row, table_id.key): row for row in _rows(response, expand)}
 
-    return results
+    results = [found[id] for id in ids if id in found]
+    missing = [id for id in ids if id not in found]
+
+    return results, missing
 
 
 async def select_all_extended(
@@ -35,12 +335,193 @@ async def select_all_extended(
     return results
 
 
+def json_value(expression: ColumnElement) -> ColumnElement:
+    """`expression` as JSON text, e.g. a column of a joined table for `json_text`."""
+    return cast(func.to_json(expression), Text)
+
+
+def json_text(schema: type[BaseModel], table_schema: Base, **nested: ColumnElement) -> ColumnElement:
+    """
+    The row as compact JSON text with the keys in `schema` field order, i.e. byte for byte
+    what the API renders for `schema.from_orm(row)`; `nested` supplies the JSON text of the
+    fields that are not columns. SQL NULL is written as `null`.
+    """
+    parts = []
+    for index, name in enumerate(schema.__fields__):
+        value = nested[name] if name in nested else json_value(getattr(table_schema, name))
+        parts += [
+            literal_column(f"""'{"," if index else "{"}"{name}":'"""),
+            func.coalesce(value, literal_column("'null'")),
+        ]
+
+    return func.concat(*parts, literal_column("'}'"))
+
+
+def json_text_array(element: ColumnElement, *order_by: ColumnElement) -> ColumnElement:
+    """Compact JSON array text of the aggregated `element`s, `[]` for no rows."""
+    aggregated = func.string_agg(element, aggregate_order_by(literal_column("','"), *order_by))
+    # concat skips the NULL of an empty aggregate
+    return func.concat(literal_column("'['"), aggregated, literal_column("']'"))
+
+
+# Equivalent to SELECT '{...}' FROM table WHERE ...;
+async def select_json(
+    session: AsyncSession,
+    document: ColumnElement,
+    *criteria: ColumnElement,
+) -> str:
+    """
+    Selects a single JSON document built by `json_text` and returns the text Postgres
+    produced, ready to be written to the response as is.
+    """
+    query = select(document).where(*criteria)
+    response = await session.execute(query)
+    result = response.scalar_one_or_none()
+
+    if result is None:
+        raise NoResultFound("Record not found")
+
+    return result
+
+
+# Equivalent to SELECT '{..., "children": [...]}' FROM table ORDER BY pk;
+async def select_all_extended_json(
+    session: AsyncSession,
+    table_schema: Base,
+    attribute_name: str,
+    schema: type[BaseModel],
+) -> list[str]:
+    """
+    Same result as `select_all_extended` rendered through `schema`, but Postgres aggregates
+    the related rows of every parent and writes the JSON, so no ORM object or pydantic model
+    is built per row. Parents and related rows are ordered by primary key.
+    """
+    relationship = inspect(table_schema).relationships.get(attribute_name)
+
+    if relationship is None or not relationship.uselist:
+        raise ValueError(
+            f"{attribute_name} is not a valid collection attribute in {table_schema.__name__}"
+        )
+
+    related_schema = schema.__fields__[attribute_name].type_
+    related_table = relationship.mapper.class_
+    related = select(
+        json_text_array(
+            json_text(related_schema, related_table),
+            *inspect(related_table).primary_key
+        )
+    )
+    if relationship.secondary is not None:
+        related = related.select_from(related_table).join(
+            relationship.secondary, relationship.secondaryjoin
+        )
+    related = related.where(relationship.primaryjoin).scalar_subquery()
+
+    query = (
+        select(json_text(schema, table_schema, **{attribute_name: related}))
+        .order_by(*inspect(table_schema).primary_key)
+    )
+    response = await session.execute(query)
+
+    return response.scalars().all()
+
+
+# Equivalent to SELECT '{..., "customer": {...}, "laptops": [...], ...}' FROM orders WHERE pk = :id;
+async def select_order_document(session: AsyncSession, order_id: UUID) -> str:
+    """
+    The order with its customer, shipment and laptop and component lines as one
+    `OrderDocumentData` JSON document, written by Postgres in a single round trip.
+    Lines are ordered by primary key.
+    """
+    customer = (
+        select(json_text(CustomerData, CustomersTable))
+        .where(CustomersTable.customer_id == OrdersTable.customer_id)
+        .scalar_subquery()
+    )
+    shipment = (
+        select(json_text(ShipmentData, ShipmentsTable))
+        .where(ShipmentsTable.shipment_id == OrdersTable.shipment_id)
+        .scalar_subquery()
+    )
+    laptops = (
+        select(json_text_array(
+            json_text(
+                OrderLaptopLineData,
+                LaptopsTable,
+                laptop_order_id=json_value(LaptopOrderTable.laptop_order_id),
+                quantity=json_value(LaptopOrderTable.quantity)
+            ),
+            LaptopOrderTable.laptop_order_id
+        ))
+        .join_from(LaptopOrderTable, LaptopsTable)
+        .where(LaptopOrderTable.order_id == OrdersTable.order_id)
+        .scalar_subquery()
+    )
+    components = (
+        select(json_text_array(
+            json_text(
+                OrderComponentLineData,
+                ComponentsTable,
+                component_order_id=json_value(ComponentOrderTable.component_order_id),
+                quantity=json_value(ComponentOrderTable.quantity)
+            ),
+            ComponentOrderTable.component_order_id
+        ))
+        .join_from(ComponentOrderTable, ComponentsTable)
+        .where(ComponentOrderTable.order_id == OrdersTable.order_id)
+        .scalar_subquery()
+    )
+
+    return await select_json(
+        session,
+        json_text(
+            OrderDocumentData,
+            OrdersTable,
+            customer=customer,
+            shipment=shipment,
+            laptops=laptops,
+            components=components
+        ),
+        OrdersTable.order_id == order_id
+    )
+
+
+# Equivalent to SELECT * FROM table; read through a server side cursor
+async def stream_all(
+    session: AsyncSession,
+    table_schema: Base,
+    expand: Sequence[str] = (),
+    fields: Sequence[str] = (),
+    filters: Sequence[Filter] = (),
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncIterator[Sequence[Any]]:
+    """
+    Yields rows in partitions of `chunk_size`, with the `expand` relationships loaded for
+    every partition, without ever materializing the full result.
+    """
+    query = (
+        _select(table_schema, expand, fields)
+        .where(*_filter_criteria(table_schema, filters))
+        .execution_options(yield_per=chunk_size)
+    )
+
+    result = await session.stream(query)
+    if expand:
+        result = result.scalars()
+    async for partition in result.partitions():
+        yield partition
+
+
 async def select_specific(
         session: AsyncSession,
         table_schema: Base,
-        id: UUID
+        id: UUID,
+        expand: Sequence[str] = (),
+        fields: Sequence[str] = ()
 ) -> Base:
-    result = await session.get(table_schema, id)
+    options = [*_expand_options(table_schema, expand), *_fields_options(table_schema, fields)]
+
+    result = await session.get(table_schema, id, options=options)
     if result is None:
         raise NoResultFound("Record not found")
 
@@ -70,40 +551,288 @@ async def select_specific_extended(
     return result.scalars().first()
 
 
-async def insert_into(session: AsyncSession, table_schema: Base, insert_data: BaseModel) -> Base:
-    insert_model = table_schema(
-        **insert_data.dict(exclude_none=True, exclude_unset=True)
-    )  # pk is auto-generated
+# Equivalent to INSERT INTO table (...) VALUES (...) RETURNING *;
+async def insert_into(session: AsyncSession, table_schema: Base, insert_data: BaseModel) -> Row:
+    """
+    Inserts a single record in one roundtrip and returns the inserted row as the database
+    stored it; the row exposes the columns as attributes, so response models can be built
+    from it with `from_orm`.
+    """
+    query = (
+        insert(table_schema.__table__)
+        .values(**insert_data.dict(exclude_none=True, exclude_unset=True))  # pk is auto-generated
+        .returning(*table_schema.__table__.columns)
+    )
 
-    session.add(insert_model)
-    await session.commit()
-    await session.refresh(insert_model)
+    response = await session.execute(query)
+    result = response.one()
 
-    return insert_model
+    return result
 
 
+# Equivalent to INSERT INTO table (...) VALUES (...), (...) RETURNING *;
+async def insert_many(
+    session: AsyncSession,
+    table_schema: Base,
+    insert_data: Sequence[dict[str, Any]],
+) -> list[Row]:
+    """
+    Inserts all records with a single multi-row INSERT and returns the rows as the database
+    stored them; primary keys are generated per row.
+    """
+    if not insert_data:
+        return []
+
+    query = (
+        insert(table_schema.__table__)
+        .values(list(insert_data))
+        .returning(*table_schema.__table__.columns)
+    )
+    response = await session.execute(query)
+
+    return response.all()
+
+
+async def _driver_connection(session: AsyncSession, begun: bool = False) -> asyncpg.Connection:
+    """
+    The asyncpg connection of the session, inside the session's transaction; `begun` tells
+    that the session already executed a statement, which opened the transaction.
+    """
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    if not begun:
+        # the asyncpg adapter only opens the transaction on the first statement it executes
+        await connection.exec_driver_sql("SELECT 1")
+
+    return raw_connection.driver_connection
+
+
+async def _missing_references(
+    session: AsyncSession,
+    table_schema: Base,
+    records: dict[int, dict[str, Any]],
+) -> tuple[dict[int, list[dict[str, Any]]], bool]:
+    """
+    Checks every foreign key of the records with one `= ANY` query per referenced table and
+    returns the errors of the records that point to a row that does not exist, and whether
+    any query was run. The referenced rows that exist are locked FOR KEY SHARE, the lock the
+    foreign key check itself takes, so they cannot be deleted before the records are written.
+    """
+    errors: dict[int, list[dict[str, Any]]] = {}
+    queried = False
+
+    for column in table_schema.__table__.columns:
+        for foreign_key in column.foreign_keys:
+            referenced = foreign_key.column
+            values = list({
+                record[column.name] for record in records.values()
+                if record.get(column.name) is not None
+            })
+            if not values:
+                continue
+
+            query = (
+                select(referenced)
+                .where(referenced == any_(literal(values, ARRAY(referenced.type))))
+                .with_for_update(key_share=True)
+            )
+            existing = set((await session.execute(query)).scalars().all())
+            queried = True
+
+            for index, record in records.items():
+                value = record.get(column.name)
+                if value is not None and value not in existing:
+                    errors.setdefault(index, []).append({
+                        "loc": [column.name],
+                        "msg": f"{referenced.table.name} {value} does not exist",
+                        "type": "value_error.foreign_key",
+                    })
+
+    return errors, queried
+
+
+# Equivalent to COPY table (...) FROM STDIN (FORMAT binary);
+async def bulk_insert(
+    session: AsyncSession,
+    table_schema: Base,
+    insert_schema: type[BaseModel],
+    rows: Sequence[Any],
+) -> tuple[list[Optional[UUID]], list[dict[str, Any]]]:
+    """
+    Validates all rows against `insert_schema` and their foreign keys in one pass, then
+    writes the valid ones with a single binary COPY inside the session's transaction.
+
+    Returns the generated primary keys in row order, None for the rejected rows, and the
+    errors of the rejected rows by index. A row never fails the rest of the batch.
+    """
+    table = table_schema.__table__
+    table_id = inspect(table_schema).primary_key[0]
+    columns = [table_id.name, *[name for name in insert_schema.__fields__ if name in table.columns]]
+
+    records: dict[int, dict[str, Any]] = {}
+    errors: dict[int, list[dict[str, Any]]] = {}
+    for index, row in enumerate(rows):
+        try:
+            records[index] = insert_schema.parse_obj(row).dict()
+        except ValidationError as exc:
+            errors[index] = exc.errors()
+
+    missing, queried = await _missing_references(session, table_schema, records)
+    for index, reference_errors in missing.items():
+        del records[index]
+        errors[index] = reference_errors
+
+    ids: list[Optional[UUID]] = [None] * len(rows)
+    for index, record in records.items():
+        record[table_id.name] = ids[index] = uuid7()
+
+    if records:
+        driver_connection = await _driver_connection(session, begun=queried)
+        await driver_connection.copy_records_to_table(
+            table.name,
+            schema_name=table.schema,
+            columns=columns,
+            records=[
+                tuple(
+                    value.value if isinstance(value, Enum) else value
+                    for value in (record[name] for name in columns)
+                )
+                for record in records.values()
+            ],
+        )
+
+    return ids, [{"index": index, "errors": errors[index]} for index in sorted(errors)]
+
+
+# Equivalent to UPDATE table SET ... WHERE pk = :id RETURNING *;
 async def update_record(
     session: AsyncSession,
     table_schema: Base,
     id: UUID,
     update_data: BaseModel
-) -> Base:
-    update_model = await select_specific(session=session, table_schema=table_schema, id=id)
+) -> Row:
+    table = table_schema.__table__
+    table_id = inspect(table_schema).primary_key[0]
+
+    values = {
+        key: value
+        for key, value in update_data.dict(exclude_none=True, exclude_unset=True).items()
+        if key in table.columns
+    }
+    if not values:
+        raise InvalidQueryError("No data to update")
+
+    query = update(table).where(table_id == id).values(**values).returning(*table.columns)
+    response = await session.execute(query)
+    result = response.one_or_none()
+
+    if result is None:
+        raise NoResultFound("Record not found")
+
+    return result
+
+
+def _changes(table_schema: Base, values: dict[str, Any]) -> ColumnElement:
+    """Rows that do not already hold `values`, updating the others would only add dead rows."""
+    table = table_schema.__table__
+    return or_(*[table.columns[key].is_distinct_from(value) for key, value in values.items()])
+
+
+# Equivalent to UPDATE table SET ... WHERE pk = ANY(:ids) AND ... RETURNING *;
+async def update_many(
+    session: AsyncSession,
+    table_schema: Base,
+    update_data: BaseModel,
+    ids: Sequence[str] = (),
+    filters: Sequence[Filter] = (),
+) -> list[Row]:
+    """
+    Applies the same values to every row selected by `ids` and/or `filters` in one set based
+    UPDATE and returns the selected rows as they are afterwards. Rows that already hold the
+    values are returned without being rewritten. Either a selection is given or nothing is
+    updated, so a bare request can never rewrite the whole table.
+    When `update_data` holds no column of `table_schema`, e.g. only values the caller cascades
+    to related tables, the selected rows are returned unchanged.
+    """
+    table = table_schema.__table__
+    table_id = inspect(table_schema).primary_key[0]
 
-    update_data = update_data.dict(exclude_none=True, exclude_unset=True)
+    if not ids and not filters:
+        raise InvalidQueryError("Select the records to update with ids or filters")
+    if len(ids) > MAX_PAGE_LIMIT:
+        raise InvalidQueryError(f"At most {MAX_PAGE_LIMIT} ids can be updated at once")
 
-    for key, value in update_data.items():
-        if hasattr(update_model, key):
-            setattr(update_model, key, value)
+    criteria = _filter_criteria(table_schema, filters)
+    if ids:
+        try:
+            ids = [_parse_value(table_id, value) for value in ids]
+        except ValueError as exc:
+            raise InvalidQueryError(f"Invalid id: {exc}") from exc
+        criteria.append(table_id == any_(literal(ids, ARRAY(table_id.type))))
 
-    session.add(update_model)
-    await session.commit()
-    await session.refresh(update_model)
+    values = {
+        key: value
+        for key, value in update_data.dict(exclude_none=True, exclude_unset=True).items()
+        if key in table.columns
+    }
+    if values:
+        changes = _changes(table_schema, values)
+        updated = (
+            update(table)
+            .where(*criteria, changes)
+            .values(**values)
+            .returning(*table.columns)
+            .cte("updated")
+        )
+        query = select(updated).union_all(select(*table.columns).where(*criteria, ~changes))
+    else:
+        query = select(*table.columns).where(*criteria)
+
+    response = await session.execute(query)
 
-    return update_model
+    return response.all()
 
 
+# Equivalent to UPDATE table SET ... WHERE fk = ANY(:ids) AND ... RETURNING pk;
+async def update_by_reference(
+    session: AsyncSession,
+    table_schema: Base,
+    reference: Column,
+    ids: Sequence[Any],
+    values: dict[str, Any],
+) -> list:
+    """
+    Applies `values` to the rows whose `reference` column points to one of `ids`, e.g. the
+    orders of some shipments, and returns the primary keys of the rows that changed. Rows
+    that already hold the values are left alone.
+    """
+    table_id = inspect(table_schema).primary_key[0]
+
+    if not ids:
+        return []
+
+    query = (
+        update(table_schema)
+        .where(reference == any_(literal(list(ids), ARRAY(reference.type))))
+        .where(_changes(table_schema, values))
+        .values(**values)
+        .returning(table_id)
+    )
+    response = await session.execute(query)
+
+    return response.scalars().all()
+
+
+# Equivalent to DELETE FROM table WHERE pk = :id RETURNING pk;
 async def delete_record(session: AsyncSession, table_schema: Base, id: UUID) -> None:
-    delete_model = await select_specific(session=session, table_schema=table_schema, id=id)
-    await session.delete(delete_model)
-    await session.commit()
+    """
+    Dependent rows are removed by the ON DELETE CASCADE foreign keys, so no relationship
+    collection is ever loaded.
+    """
+    table_id = inspect(table_schema).primary_key[0]
+
+    query = delete(table_schema.__table__).where(table_id == id).returning(table_id)
+    response = await session.execute(query)
+
+    if response.scalar_one_or_none() is None:
+        raise NoResultFound("Record not found")
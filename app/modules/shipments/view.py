@@ -2,10 +2,36 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.base.dependencies.db import get_session
+from app.base.dependencies.bulk import get_bulk_rows
+from app.base.dependencies.db import (
+    get_bulk_read_only_session,
+    get_read_only_session,
+    get_session
+)
+from app.base.dependencies.expand import get_expand
+from app.base.dependencies.fields import get_fields
+from app.base.dependencies.filters import Filter, Sorting, get_filters, get_sorting
+from app.base.dependencies.ids import get_ids
+from app.base.dependencies.pagination import Pagination, get_pagination
+from app.base.dependencies.streaming import is_stream_requested
+from app.base.responses import (
+    empty_update_response,
+    from_orm_loaded,
+    json_document_response,
+    ndjson_response,
+    trusted_response
+)
+from app.base.routing import UnitOfWorkRoute
+from app.base.schemas import BulkCreateResponse
+from app.db.models.orders import OrdersTable
 from app.db.models.shipments import ShipmentsTable
 from app.modules.orders.schemas import (
+    BulkPatchShipment,
+    BulkPatchShipmentsResponse,
+    ShipmentExpandedData,
+    ShipmentExpandedResponse,
     ShipmentOrdersData,
+    ShipmentsExpandedResponse,
     ShipmentsOrdersResponse,
     ShipmentOrdersResponse
 )
@@ -19,17 +45,22 @@ from app.modules.shipments.schemas import (
     Status,
 )
 from app.modules.servicer import (
+    bulk_insert,
     delete_record,
     insert_into,
-    select_all,
-    select_all_extended,
+    select_all_extended_json,
+    select_many,
+    select_page,
     select_specific,
     select_specific_extended,
+    stream_all,
+    update_by_reference,
+    update_many,
     update_record,
 )
 
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 # CREATE
@@ -38,66 +69,171 @@ async def insert_shipment(
     shipment_data: Shipment,
     session: AsyncSession = Depends(get_session)
 ):
-    shipment: ShipmentsTable = await insert_into(
+    shipment = await insert_into(
         session=session,
         table_schema=ShipmentsTable,
         insert_data=shipment_data
     )
 
-    return StandardShipmentResponse(
-        status=201,
-        message="Shipment created successfully",
-        data=ShipmentData.from_orm(shipment)
+    return trusted_response(
+        StandardShipmentResponse(
+            status=201,
+            message="Shipment created successfully",
+            data=ShipmentData.from_orm(shipment)
+        )
+    )
+
+
+# CREATE - many, from a JSON array or NDJSON body
+@router.post("/api/shipments/bulk", tags=["shipments"], response_model=BulkCreateResponse)
+async def create_shipments(
+    rows: list = Depends(get_bulk_rows),
+    session: AsyncSession = Depends(get_session)
+):
+    ids, errors = await bulk_insert(
+        session=session,
+        table_schema=ShipmentsTable,
+        insert_schema=Shipment,
+        rows=rows
+    )
+
+    return trusted_response(
+        BulkCreateResponse(
+            status=201,
+            message=f"Shipments created: {len(rows) - len(errors)}, rejected: {len(errors)}",
+            data=ids,
+            errors=errors
+        )
     )
 
 
 # READ - all shipments
-@router.get("/api/shipments", tags=["shipments"], response_model=StandardShipmentsResponse)
-async def get_shipments(session: AsyncSession = Depends(get_session)):
-    shipments: list[ShipmentsTable] = await select_all(
+@router.get(
+    "/api/shipments",
+    tags=["shipments"],
+    response_model=ShipmentsExpandedResponse,
+    response_model_exclude_unset=True
+)
+async def get_shipments(
+    pagination: Pagination = Depends(get_pagination),
+    filters: list[Filter] = Depends(get_filters),
+    sorting: Sorting = Depends(get_sorting),
+    expand: list[str] = Depends(get_expand),
+    fields: list[str] = Depends(get_fields),
+    ids: list[str] = Depends(get_ids),
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_read_only_session)
+):
+    if ids:
+        shipments, missing_ids = await select_many(
+            session=session,
+            table_schema=ShipmentsTable,
+            ids=ids,
+            expand=expand,
+            fields=fields,
+            filters=filters
+        )
+
+        return trusted_response(
+            ShipmentsExpandedResponse(
+                status=200,
+                message="Shipments sucessfully retrieved",
+                data=[from_orm_loaded(ShipmentExpandedData, shipment) for shipment in shipments],
+                missing_ids=missing_ids
+            ),
+            exclude_unset=True
+        )
+
+    if stream:
+        return ndjson_response(
+            stream_all(
+                session=session,
+                table_schema=ShipmentsTable,
+                expand=expand,
+                fields=fields,
+                filters=filters
+            ),
+            ShipmentExpandedData
+        )
+
+    shipments, next_cursor = await select_page(
         session=session,
-        table_schema=ShipmentsTable
+        table_schema=ShipmentsTable,
+        limit=pagination.limit,
+        after=pagination.after,
+        order_by=sorting.column,
+        descending=sorting.descending,
+        expand=expand,
+        fields=fields,
+        filters=filters
     )
 
-    return StandardShipmentsResponse(
-        status=200,
-        message="Shipments sucessfully retrieved",
-        data=[ShipmentData.from_orm(shipment) for shipment in shipments],
+    return trusted_response(
+        ShipmentsExpandedResponse(
+            status=200,
+            message="Shipments sucessfully retrieved",
+            data=[from_orm_loaded(ShipmentExpandedData, shipment) for shipment in shipments],
+            next_cursor=next_cursor
+        ),
+        exclude_unset=True
     )
 
 
 # READ - shipments' orders
 @router.get("/api/shipments/orders", tags=["shipments"], response_model=ShipmentsOrdersResponse)
-async def get_shipments_orders(session: AsyncSession = Depends(get_session)):
-    shipments: list[ShipmentsTable] = await select_all_extended(
+async def get_shipments_orders(
+    stream: bool = Depends(is_stream_requested),
+    session: AsyncSession = Depends(get_bulk_read_only_session)
+):
+    if stream:
+        return ndjson_response(
+            stream_all(session=session, table_schema=ShipmentsTable, expand=["orders"]),
+            ShipmentOrdersData
+        )
+
+    # the JSON is written by Postgres and passed through as is
+    shipments = await select_all_extended_json(
         session=session,
         table_schema=ShipmentsTable,
-        attribute_name="orders"
+        attribute_name="orders",
+        schema=ShipmentOrdersData
     )
 
-    return ShipmentsOrdersResponse(
+    return json_document_response(
         status=200,
         message="Shipments sucessfully retrieved",
-        data=[ShipmentOrdersData.from_orm(shipment) for shipment in shipments],
+        data=f"[{','.join(shipments)}]"
     )
 
 
 # READ - specific shipment
-@router.get("/api/shipments/{shipment_id}", tags=["shipments"], response_model=StandardShipmentResponse)
+@router.get(
+    "/api/shipments/{shipment_id}",
+    tags=["shipments"],
+    response_model=ShipmentExpandedResponse,
+    response_model_exclude_unset=True
+)
 async def get_shipment(
     shipment_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    expand: list[str] = Depends(get_expand),
+    fields: list[str] = Depends(get_fields),
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     shipment: ShipmentsTable = await select_specific(
         session=session,
         table_schema=ShipmentsTable,
-        id=shipment_id
+        id=shipment_id,
+        expand=expand,
+        fields=fields
     )
 
-    return StandardShipmentResponse(
-        status=200,
-        message="Shipment sucessfully retrieved",
-        data=ShipmentData.from_orm(shipment)
+    return trusted_response(
+        ShipmentExpandedResponse(
+            status=200,
+            message="Shipment sucessfully retrieved",
+            data=from_orm_loaded(ShipmentExpandedData, shipment)
+        ),
+        exclude_unset=True
     )
 
 
@@ -105,7 +241,7 @@ async def get_shipment(
 @router.get("/api/shipments/{shipment_id}/orders", tags=["shipments"], response_model=ShipmentOrdersResponse)
 async def get_shipment_orders(
     shipment_id: UUID,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     shipment: ShipmentsTable = await select_specific_extended(
         session=session,
@@ -114,10 +250,12 @@ async def get_shipment_orders(
         attribute_name="orders"
     )
 
-    return ShipmentOrdersResponse(
-        status=200,
-        message="Shipment and orders sucessfully retrieved",
-        data=ShipmentOrdersData.from_orm(shipment),
+    return trusted_response(
+        ShipmentOrdersResponse(
+            status=200,
+            message="Shipment and orders sucessfully retrieved",
+            data=ShipmentOrdersData.from_orm(shipment),
+        )
     )
 
 
@@ -125,7 +263,7 @@ async def get_shipment_orders(
 @router.get("/api/shipments/status/{shipment_status}", tags=["shipments"], response_model=StandardShipmentsResponse)
 async def filter_by_status(
     shipment_status: Status,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_only_session)
 ):
     query = (
         select(ShipmentsTable).
@@ -135,10 +273,12 @@ async def filter_by_status(
     response = await session.execute(query)
     shipments = response.scalars().all()
 
-    return StandardShipmentsResponse(
-        status=200,
-        message="Shipments filtered successfully",
-        data=[ShipmentData.from_orm(shipment) for shipment in shipments]
+    return trusted_response(
+        StandardShipmentsResponse(
+            status=200,
+            message="Shipments filtered successfully",
+            data=[ShipmentData.from_orm(shipment) for shipment in shipments]
+        )
     )
 
 
@@ -153,24 +293,63 @@ async def patch_shipment(
 ):
     update_data_dict = update_data.dict(exclude_none=True, exclude_unset=True)
 
-    shipment: ShipmentsTable = await update_record(
+    if len(update_data_dict) == 0:
+        return empty_update_response()
+
+    shipment = await update_record(
         session=session,
         table_schema=ShipmentsTable,
         id=shipment_id,
         update_data=update_data
     )
 
-    if len(update_data_dict) == 0:
-        return StandardShipmentResponse(
-            status=400,
-            message="No data to update, please check your data.",
+    return trusted_response(
+        StandardShipmentResponse(
+            status=200,
+            message="Shipment updated successfully",
             data=ShipmentData.from_orm(shipment)
         )
+    )
 
-    return StandardShipmentResponse(
-        status=200,
-        message="Shipment updated successfully",
-        data=ShipmentData.from_orm(shipment)
+
+# UPDATE - many, selected by ?ids= and/or filters, e.g. ?shipment_status=pending
+@router.patch("/api/shipments", tags=["shipments"], response_model=BulkPatchShipmentsResponse)
+async def patch_shipments(
+    update_data: BulkPatchShipment,
+    ids: list[str] = Depends(get_ids),
+    filters: list[Filter] = Depends(get_filters),
+    session: AsyncSession = Depends(get_session)
+):
+    update_data_dict = update_data.dict(exclude_none=True, exclude_unset=True)
+
+    if len(update_data_dict) == 0:
+        return empty_update_response()
+
+    shipments = await update_many(
+        session=session,
+        table_schema=ShipmentsTable,
+        update_data=update_data,
+        ids=ids,
+        filters=filters
+    )
+
+    orders_updated = []
+    if update_data.order_status is not None:
+        orders_updated = await update_by_reference(
+            session=session,
+            table_schema=OrdersTable,
+            reference=OrdersTable.shipment_id,
+            ids=[shipment.shipment_id for shipment in shipments],
+            values={"order_status": update_data.order_status}
+        )
+
+    return trusted_response(
+        BulkPatchShipmentsResponse(
+            status=200,
+            message="Shipments updated successfully",
+            data=[ShipmentData.from_orm(shipment) for shipment in shipments],
+            orders_updated=orders_updated
+        )
     )
 
 
@@ -190,7 +369,9 @@ async def delete_shipment(
         id=shipment_id
     )
 
-    return DeleteShipmentResponse(
-        status=200,
-        message="Shipment deleted successfully"
+    return trusted_response(
+        DeleteShipmentResponse(
+            status=200,
+            message="Shipment deleted successfully"
+        )
     )
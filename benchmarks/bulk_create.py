@@ -0,0 +1,55 @@
+"""
+Insert throughput of `POST /api/laptops` once per row versus `POST /api/laptops/bulk`.
+
+    python -m benchmarks.bulk_create --rows 2000 --bulk-rows 100000
+
+Both run in-process against the configured database; the created laptops are deleted
+afterwards.
+"""
+import argparse
+import asyncio
+import time
+
+from httpx import AsyncClient
+from sqlalchemy import delete
+
+import app.base.application as application
+from app.db.models.laptops import LaptopsTable
+from app.db.session import async_session, dispose_engines
+
+
+def laptop(i: int) -> dict:
+    return {"manufacturer": "bench", "model": f"model {i}", "make_year": 2024}
+
+
+async def run(rows: int, bulk_rows: int) -> None:
+    async with AsyncClient(app=application.create_app(), base_url="http://bench") as client:
+        started = time.perf_counter()
+        for i in range(rows):
+            response = await client.post("/api/laptops", json=laptop(i))
+            assert response.json()["status"] == 201, response.text
+        single = rows / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/laptops/bulk", json=[laptop(i) for i in range(bulk_rows)], timeout=None
+        )
+        assert response.json()["errors"] == [], response.text
+        bulk = bulk_rows / (time.perf_counter() - started)
+
+    async with async_session() as session:
+        await session.execute(delete(LaptopsTable).where(LaptopsTable.manufacturer == "bench"))
+        await session.commit()
+    await dispose_engines()
+
+    print(f"POST /api/laptops x{rows}: {single:,.0f} rows/s")
+    print(f"POST /api/laptops/bulk with {bulk_rows} rows: {bulk:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--bulk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.bulk_rows))
@@ -0,0 +1,96 @@
+"""
+Memory per row and rows per second of the list read path: orders loaded as mapped
+`OrdersTable` instances, versus the plain Core rows the servicer now selects without ?expand=.
+
+    python -m benchmarks.core_rows --rows 1000000
+
+Memory is what the fetched result retains, traced with tracemalloc, while holding the session
+open like a view does. Throughput is measured without tracemalloc, once for the fetch alone and
+once streaming the rows the way `?stream=true` does, through the response model and orjson.
+The `orders` table needs at least `--rows` rows.
+"""
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+
+import orjson
+from sqlalchemy import select
+
+import app.base.application  # noqa: F401, maps every model
+from app.base.constants import STREAM_CHUNK_SIZE
+from app.base.responses import _encode_model, from_orm_loaded
+from app.db.models.orders import OrdersTable
+from app.db.session import dispose_engines, read_only_session_factory, Workload
+from app.modules.orders.schemas import OrderExpandedData
+from app.modules.servicer import _select
+
+
+def orm_query():
+    return select(OrdersTable)
+
+
+def core_query():
+    return _select(OrdersTable, expand=(), fields=())
+
+
+async def fetch(query, rows: int, orm: bool, trace: bool) -> int:
+    async with read_only_session_factory(Workload.BULK) as session:
+        gc.collect()
+        if trace:
+            tracemalloc.start()
+        result = await session.execute(query.limit(rows))
+        results = result.scalars().all() if orm else result.all()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(results) == rows, f"orders has only {len(results)} rows"
+        return retained
+
+
+async def stream(query, rows: int, orm: bool) -> int:
+    size = 0
+    async with read_only_session_factory(Workload.BULK) as session:
+        result = await session.stream(
+            query.limit(rows).execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+        if orm:
+            result = result.scalars()
+        async for partition in result.partitions():
+            size += len(
+                b"".join(
+                    orjson.dumps(
+                        from_orm_loaded(OrderExpandedData, row).dict(exclude_unset=True),
+                        default=_encode_model,
+                    ) + b"\n"
+                    for row in partition
+                )
+            )
+    return size
+
+
+async def run(rows: int) -> None:
+    for name, query, orm in (("orm", orm_query(), True), ("core", core_query(), False)):
+        retained = await fetch(query, rows, orm, trace=True)
+
+        started = time.perf_counter()
+        await fetch(query, rows, orm, trace=False)
+        fetched = time.perf_counter() - started
+
+        started = time.perf_counter()
+        size = await stream(query, rows, orm)
+        streamed = time.perf_counter() - started
+        print(
+            f"{name}: {rows} rows, {retained / rows:,.0f} B/row retained, "
+            f"{rows / fetched:,.0f} rows/s fetched, "
+            f"{rows / streamed:,.0f} rows/s streamed ({size / 2 ** 20:,.1f} MiB)"
+        )
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows))
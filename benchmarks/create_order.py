@@ -0,0 +1,57 @@
+"""
+Latency of `POST /api/orders` measured in-process against the configured database.
+
+    python -m benchmarks.create_order --requests 2000
+
+The database must be migrated (`make migrate`); a customer is seeded before the run.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+from httpx import AsyncClient
+
+import app.base.application as application
+from app.db.models.customers import CustomersTable
+from app.db.session import async_session, engine
+
+
+async def seed_customer() -> str:
+    async with async_session() as session:
+        customer = CustomersTable(customer_id=uuid4(), first_name="bench", last_name="bench")
+        session.add(customer)
+        await session.commit()
+        return str(customer.customer_id)
+
+
+async def run(requests: int, warmup: int) -> None:
+    customer_id = await seed_customer()
+    payload = {"customer_id": customer_id, "order_date": "2024-01-01", "order_status": "pending"}
+    latencies = []
+
+    async with AsyncClient(app=application.create_app(), base_url="http://bench") as client:
+        for i in range(warmup + requests):
+            started = time.perf_counter()
+            response = await client.post("/api/orders", json=payload)
+            elapsed = time.perf_counter() - started
+            assert response.json()["status"] == 201, response.text
+            if i >= warmup:
+                latencies.append(elapsed * 1000)
+
+    await engine.dispose()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"POST /api/orders x{requests}")
+    print(f"p50: {percentiles[49]:.3f} ms")
+    print(f"p99: {percentiles[98]:.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests, args.warmup))
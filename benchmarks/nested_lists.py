@@ -0,0 +1,79 @@
+"""
+Worker CPU time of the nested list endpoints, per 10k parents: related rows loaded into ORM
+objects and rendered through pydantic, versus aggregated into JSON by Postgres.
+
+    python -m benchmarks.nested_lists --route customers/orders
+
+Both paths read every parent of the configured database, like the endpoints do. Only the
+CPU time of this process is reported; the time Postgres spends is not included.
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import app.base.application  # noqa: F401, maps every model
+from app.base.responses import json_document_response
+from app.db.models.customers import CustomersTable
+from app.db.models.orders import OrdersTable
+from app.db.models.shipments import ShipmentsTable
+from app.db.session import dispose_engines, read_only_session_factory, Workload
+from app.modules.orders.schemas import (
+    CustomerOrdersData,
+    CustomersOrdersResponse,
+    OrderComponentsData,
+    OrderLaptopsData,
+    OrdersComponentsResponse,
+    OrdersLaptopsResponse,
+    ShipmentOrdersData,
+    ShipmentsOrdersResponse,
+)
+from app.modules.servicer import select_all_extended, select_all_extended_json
+
+ROUTES = {
+    "customers/orders": (CustomersTable, "orders", CustomerOrdersData, CustomersOrdersResponse),
+    "shipments/orders": (ShipmentsTable, "orders", ShipmentOrdersData, ShipmentsOrdersResponse),
+    "orders/laptops": (OrdersTable, "laptops", OrderLaptopsData, OrdersLaptopsResponse),
+    "orders/components": (OrdersTable, "components", OrderComponentsData, OrdersComponentsResponse),
+}
+
+
+async def render_orm(route: str) -> tuple[int, int]:
+    table_schema, attribute_name, schema, response_schema = ROUTES[route]
+    async with read_only_session_factory(Workload.BULK) as session:
+        rows = await select_all_extended(session, table_schema, attribute_name)
+        response = response_schema(
+            status=200, message="", data=[schema.from_orm(row) for row in rows]
+        )
+        return len(rows), len(JSONResponse(jsonable_encoder(response)).body)
+
+
+async def render_sql(route: str) -> tuple[int, int]:
+    table_schema, attribute_name, schema, _ = ROUTES[route]
+    async with read_only_session_factory(Workload.BULK) as session:
+        rows = await select_all_extended_json(session, table_schema, attribute_name, schema)
+        response = json_document_response(status=200, message="", data=f"[{','.join(rows)}]")
+        return len(rows), len(response.body)
+
+
+async def run(route: str) -> None:
+    for name, render in (("orm", render_orm), ("sql", render_sql)):
+        started, cpu_started = time.perf_counter(), time.process_time()
+        parents, size = await render(route)
+        cpu = time.process_time() - cpu_started
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name}: {parents} parents, {size / 2 ** 20:,.1f} MiB, wall {elapsed:.2f} s, "
+            f"cpu {cpu / parents * 10_000:.3f} s per 10k parents"
+        )
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--route", choices=ROUTES, default="customers/orders")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.route))
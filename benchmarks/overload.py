@@ -0,0 +1,62 @@
+"""
+Latency of admitted requests under a burst larger than the connection pool, with and without
+admission control.
+
+    python -m benchmarks.overload --burst 1000 --limit 100
+
+The database must be migrated (`make migrate`) and hold some orders
+(`python -m benchmarks.query_plans --seed`); every request lists `--limit` orders.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import AsyncClient
+
+import app.base.application as application
+from app.base.admission import AdmissionControlMiddleware
+from app.db.session import dispose_engines
+
+
+async def burst(admission_control: bool, requests: int, limit: int) -> None:
+    app = application.create_app()
+    if not admission_control:
+        app.user_middleware = [
+            middleware for middleware in app.user_middleware
+            if middleware.cls is not AdmissionControlMiddleware
+        ]
+
+    async with AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        async def get() -> tuple[int, float]:
+            started = time.perf_counter()
+            response = await client.get(f"/api/orders?limit={limit}")
+            return response.status_code, (time.perf_counter() - started) * 1000
+
+        await get()  # warm up the pool
+        started = time.perf_counter()
+        results = await asyncio.gather(*(get() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    await dispose_engines()
+
+    admitted = [latency for status, latency in results if status == 200]
+    rejected = sum(1 for status, _ in results if status == 503)
+    percentiles = statistics.quantiles(admitted, n=100)
+    print(f"admission control {'on' if admission_control else 'off'}:")
+    print(f"  admitted {len(admitted)}, rejected {rejected}, burst took {elapsed:.2f} s")
+    print(f"  admitted p50: {percentiles[49]:.1f} ms, p99: {percentiles[98]:.1f} ms")
+
+
+async def run(requests: int, limit: int) -> None:
+    await burst(False, requests, limit)
+    await burst(True, requests, limit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--burst", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.burst, args.limit))
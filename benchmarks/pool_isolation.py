@@ -0,0 +1,70 @@
+"""
+Healthcheck latency during a burst of heavy reads, with the heavy reads on the `bulk` pool
+versus on the same pool as the healthcheck.
+
+    python -m benchmarks.pool_isolation --heavy 20 --duration 0.5 --probes 50
+
+A heavy read holds a read-only connection for `--duration` seconds (`pg_sleep`), the way
+`/api/customers/orders` does over a large table. Every 50 ms a probe calls
+`/api/healthcheck`, which uses the `critical` pool.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import AsyncClient
+from sqlalchemy import text
+
+import app.base.application as application
+from app.db.session import dispose_engines, read_only_session_factory, Workload
+
+
+async def heavy_read(workload: Workload, duration: float) -> None:
+    async with read_only_session_factory(workload) as session:
+        await session.execute(text("SELECT pg_sleep(:duration)"), {"duration": duration})
+
+
+async def run_burst(workload: Workload, heavy: int, duration: float, probes: int) -> None:
+    latencies: list[float] = []
+    failures = 0
+
+    async with AsyncClient(app=application.create_app(), base_url="http://bench") as client:
+        await client.get("/api/healthcheck")
+
+        async def probe() -> None:
+            nonlocal failures
+            for _ in range(probes):
+                started = time.perf_counter()
+                response = await client.get("/api/healthcheck")
+                latencies.append((time.perf_counter() - started) * 1000)
+                if not response.json()["is_database_working"]:
+                    failures += 1
+                await asyncio.sleep(0.05)
+
+        async def burst() -> None:
+            for _ in range(int(probes * 0.05 / duration) or 1):
+                await asyncio.gather(*(heavy_read(workload, duration) for _ in range(heavy)))
+
+        await asyncio.gather(probe(), burst())
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"heavy reads on the {workload.value} pool:")
+    print(f"  healthcheck p50: {percentiles[49]:.1f} ms, p99: {percentiles[98]:.1f} ms")
+    print(f"  healthcheck reported the database down {failures}/{probes} times")
+
+
+async def run(heavy: int, duration: float, probes: int) -> None:
+    await run_burst(Workload.CRITICAL, heavy, duration, probes)
+    await run_burst(Workload.BULK, heavy, duration, probes)
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--heavy", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=0.5)
+    parser.add_argument("--probes", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.heavy, args.duration, args.probes))
@@ -0,0 +1,149 @@
+"""
+EXPLAIN (ANALYZE, BUFFERS) report for the queries issued by the relationship loaders,
+the FK cascades and the filtered/sorted list endpoints.
+
+    python -m benchmarks.query_plans --seed --orders 1000000
+
+Run it against a dedicated, migrated database: `--seed` inserts synthetic rows.
+Compare the report before and after `alembic upgrade` to see the effect of an index migration.
+"""
+import argparse
+import re
+
+from sqlalchemy import create_engine, text
+
+from app.base.settings import settings
+
+
+SEED = [
+    """
+    INSERT INTO customers (customer_id, first_name, last_name, email)
+    SELECT gen_random_uuid(), 'first_' || i, 'last_' || i, 'user_' || i || '@example.com'
+    FROM generate_series(1, :customers) AS i
+    """,
+    """
+    INSERT INTO shipments (shipment_id, shipment_date, shipment_status, shipment_address)
+    SELECT gen_random_uuid(), DATE '2023-01-01' + (i % 365),
+           (ARRAY['pending', 'shipped', 'delivered'])[1 + i % 3], 'address_' || i
+    FROM generate_series(1, :customers) AS i
+    """,
+    """
+    INSERT INTO laptops (laptop_id, manufacturer, model, make_year)
+    SELECT gen_random_uuid(), 'manufacturer_' || (i % 50), 'model_' || i, 2019 + i % 5
+    FROM generate_series(1, :catalog) AS i
+    """,
+    """
+    INSERT INTO components (component_id, type, description, make_year)
+    SELECT gen_random_uuid(), (ARRAY['CPU', 'GPU', 'RAM', 'SSD'])[1 + i % 4], 'description_' || i,
+           2019 + i % 5
+    FROM generate_series(1, :catalog) AS i
+    """,
+    """
+    INSERT INTO orders (order_id, order_date, order_status, customer_id, shipment_id)
+    SELECT gen_random_uuid(), DATE '2023-01-01' + (i % 365),
+           (ARRAY['pending', 'in progress', 'finished'])[1 + i % 3], c.customer_id, s.shipment_id
+    FROM generate_series(1, :orders) AS i
+    JOIN (SELECT customer_id, row_number() OVER () AS n FROM customers) c
+      ON c.n = 1 + i % :customers
+    JOIN (SELECT shipment_id, row_number() OVER () AS n FROM shipments) s
+      ON s.n = 1 + i % :customers
+    """,
+    """
+    INSERT INTO laptop_order (laptop_order_id, order_id, laptop_id, quantity)
+    SELECT gen_random_uuid(), o.order_id, l.laptop_id, 1
+    FROM (SELECT order_id, row_number() OVER () AS n FROM orders) o
+    JOIN (SELECT laptop_id, row_number() OVER () AS n FROM laptops) l
+      ON l.n = 1 + o.n % :catalog
+    """,
+    """
+    INSERT INTO component_order (component_order_id, order_id, component_id, quantity)
+    SELECT gen_random_uuid(), o.order_id, c.component_id, 1
+    FROM (SELECT order_id, row_number() OVER () AS n FROM orders) o
+    JOIN (SELECT component_id, row_number() OVER () AS n FROM components) c
+      ON c.n = 1 + o.n % :catalog
+    """,
+    """
+    INSERT INTO laptops_components (laptop_id, component_id)
+    SELECT l.laptop_id, c.component_id
+    FROM (SELECT laptop_id, row_number() OVER () AS n FROM laptops) l
+    JOIN (SELECT component_id, row_number() OVER () AS n FROM components) c
+      ON c.n BETWEEN l.n AND l.n + 9
+    """,
+]
+
+QUERIES = {
+    "GET /api/customers/{id}/orders (selectinload)": """
+        SELECT * FROM orders
+        WHERE customer_id IN (SELECT customer_id FROM customers LIMIT 1)
+    """,
+    "GET /api/components/{id}/laptops (selectinload)": """
+        SELECT laptops.* FROM laptops
+        JOIN laptops_components ON laptops.laptop_id = laptops_components.laptop_id
+        WHERE laptops_components.component_id IN (SELECT component_id FROM components LIMIT 1)
+    """,
+    "GET /api/orders/{id}?expand=laptops (selectinload)": """
+        SELECT laptops.* FROM laptops
+        JOIN laptop_order ON laptops.laptop_id = laptop_order.laptop_id
+        WHERE laptop_order.order_id IN (SELECT order_id FROM orders LIMIT 1)
+    """,
+    "GET /api/shipments?shipment_status=pending": """
+        SELECT * FROM shipments
+        WHERE shipment_status = 'pending'
+        ORDER BY shipment_id LIMIT 101
+    """,
+    "GET /api/orders?order_status=pending": """
+        SELECT * FROM orders
+        WHERE order_status = 'pending'
+        ORDER BY order_id LIMIT 101
+    """,
+    "GET /api/orders?sort=-order_date": """
+        SELECT * FROM orders
+        ORDER BY order_date DESC, order_id DESC LIMIT 101
+    """,
+    "GET /api/orders?fields=order_status": """
+        SELECT order_id, order_status FROM orders
+        ORDER BY order_id LIMIT 101
+    """,
+    "DELETE /api/customers/{id} (ON DELETE CASCADE)": """
+        DELETE FROM customers
+        WHERE customer_id = (SELECT customer_id FROM customers LIMIT 1)
+    """,
+}
+
+
+def seed(connection, orders: int) -> None:
+    params = {"orders": orders, "customers": max(orders // 10, 1), "catalog": max(orders // 100, 10)}
+    for statement in SEED:
+        connection.execute(text(statement), params)
+    connection.execute(text("ANALYZE"))
+
+
+def report(connection) -> None:
+    for name, query in QUERIES.items():
+        transaction = connection.begin()
+        plan = connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query}")).scalars().all()
+        transaction.rollback()
+
+        execution = next(line for line in plan if line.startswith("Execution Time"))
+        scans = sorted({
+            match.group(0)
+            for line in plan
+            for match in [re.search(r"(Seq|Index Only|Index|Bitmap Heap) Scan", line)]
+            if match
+        })
+        print(f"## {name}: {execution.split(': ')[1]} [{', '.join(scans)}]")
+        print("\n".join(plan), end="\n\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", action="store_true", help="insert synthetic rows first")
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    with engine.connect() as connection:
+        if args.seed:
+            with connection.begin():
+                seed(connection, args.orders)
+        report(connection)
@@ -0,0 +1,78 @@
+"""
+Throughput of read endpoints served by the read-only session versus the committing session.
+
+    python -m benchmarks.read_sessions --requests 5000 --concurrency 10
+
+The database must be migrated (`make migrate`); an order is seeded before the run.
+Both runs go through the same app; the baseline swaps `get_read_only_session` for
+`get_session` with a dependency override.
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+from uuid import uuid4
+
+from httpx import AsyncClient
+
+import app.base.application as application
+from app.base.dependencies.db import get_read_only_session, get_session
+from app.db.models.customers import CustomersTable
+from app.db.models.orders import OrdersTable
+from app.db.session import async_session, dispose_engines
+
+
+async def seed_order() -> str:
+    async with async_session() as session:
+        customer = CustomersTable(customer_id=uuid4(), first_name="bench", last_name="bench")
+        order = OrdersTable(
+            order_id=uuid4(),
+            customer_id=customer.customer_id,
+            order_date=date(2024, 1, 1),
+            order_status="pending",
+        )
+        session.add_all([customer, order])
+        await session.commit()
+        return str(order.order_id)
+
+
+async def measure(client: AsyncClient, urls: list[str], requests: int, concurrency: int) -> float:
+    async def worker(count: int) -> None:
+        for i in range(count):
+            response = await client.get(urls[i % len(urls)])
+            assert response.status_code == 200, response.text
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def run(requests: int, concurrency: int, warmup: int) -> None:
+    order_id = await seed_order()
+    urls = [f"/api/orders/{order_id}", "/api/healthcheck"]
+    app = application.create_app()
+
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        await measure(client, urls, warmup, concurrency)
+
+        app.dependency_overrides[get_read_only_session] = get_session
+        committing = await measure(client, urls, requests, concurrency)
+
+        app.dependency_overrides.clear()
+        read_only = await measure(client, urls, requests, concurrency)
+
+    await dispose_engines()
+
+    print(f"GET {', '.join(urls)} x{requests}, concurrency {concurrency}")
+    print(f"get_session:           {committing:,.0f} req/s")
+    print(f"get_read_only_session: {read_only:,.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests, args.concurrency, args.warmup))
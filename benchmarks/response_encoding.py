@@ -0,0 +1,72 @@
+"""
+Worker CPU time to encode a list response of `OrderData` rows: FastAPI's default path, which
+validates the returned model against `response_model` again and walks it with
+`jsonable_encoder` before `json.dumps`, versus `trusted_response`, which hands the model's
+dict straight to orjson.
+
+    python -m benchmarks.response_encoding --rows 100000
+
+Rows are built in memory, no database is needed. Both paths must render the same bytes.
+"""
+import argparse
+import asyncio
+import datetime
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.base.responses import trusted_response
+from app.db.keys import uuid7
+from app.modules.orders.schemas import OrderData, StandardOrdersResponse, Status
+
+
+def build_response(rows: int) -> StandardOrdersResponse:
+    today = datetime.date.today()
+    statuses = list(Status)
+    data = [
+        OrderData(
+            order_id=uuid7(),
+            customer_id=uuid7(),
+            shipment_id=uuid7() if index % 2 else None,
+            order_date=today - datetime.timedelta(days=index % 365),
+            order_status=statuses[index % len(statuses)],
+        )
+        for index in range(rows)
+    ]
+    return StandardOrdersResponse(status=200, message="Retrieved orders", data=data)
+
+
+async def render_default(response: StandardOrdersResponse) -> bytes:
+    field = create_response_field(name="response", type_=StandardOrdersResponse)
+    content = await serialize_response(field=field, response_content=response)
+    return JSONResponse(content).body
+
+
+async def render_trusted(response: StandardOrdersResponse) -> bytes:
+    return trusted_response(response).body
+
+
+async def run(rows: int, repeat: int) -> None:
+    response = build_response(rows)
+    bodies = []
+    for name, render in (("default", render_default), ("trusted", render_trusted)):
+        best = float("inf")
+        for _ in range(repeat):
+            cpu_started = time.process_time()
+            body = await render(response)
+            best = min(best, time.process_time() - cpu_started)
+        bodies.append(body)
+        print(f"{name}: {rows} rows, {len(body) / 2 ** 20:,.1f} MiB, cpu {best * 1000:,.0f} ms")
+
+    assert bodies[0] == bodies[1], "encodings differ"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.repeat))
@@ -0,0 +1,100 @@
+"""
+Latency of fast clients while slow clients are reading their responses.
+
+    python -m benchmarks.slow_clients --slow 50 --delay 0.5 --fast 500
+
+Requests are driven straight through the ASGI interface. A slow client sleeps for `--delay`
+seconds before accepting each message the app sends, as a client on a bad mobile link would.
+Pool occupancy is sampled on every message. It should track the time spent querying, not how
+long slow clients take to read the body.
+The database must be migrated (`make migrate`); an order is seeded before the run.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date
+from uuid import uuid4
+
+import app.base.application as application
+from app.db.models.customers import CustomersTable
+from app.db.models.orders import OrdersTable
+from app.db.session import async_session, dispose_engines, engines, Workload
+
+
+async def seed_order() -> str:
+    async with async_session() as session:
+        customer = CustomersTable(customer_id=uuid4(), first_name="bench", last_name="bench")
+        order = OrdersTable(
+            order_id=uuid4(),
+            customer_id=customer.customer_id,
+            order_date=date(2024, 1, 1),
+            order_status="pending",
+        )
+        session.add_all([customer, order])
+        await session.commit()
+        return str(order.order_id)
+
+
+async def get(app, path: str, delay: float, checked_out: list[int]) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "server": ("bench", 80),
+        "client": ("bench", 1234),
+    }
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        checked_out.append(engines[Workload.READ].pool.checkedout())
+        if delay:
+            await asyncio.sleep(delay)
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    return (time.perf_counter() - started) * 1000
+
+
+async def run(slow: int, delay: float, fast: int, concurrency: int) -> None:
+    path = f"/api/orders/{await seed_order()}"
+    app = application.create_app()
+    checked_out: list[int] = []
+
+    async def fast_worker() -> list[float]:
+        await asyncio.sleep(delay / 2)  # let the slow clients take their connections first
+        return [await get(app, path, 0, checked_out) for _ in range(fast // concurrency)]
+
+    slow_clients = [get(app, path, delay, checked_out) for _ in range(slow)]
+    results = await asyncio.gather(
+        asyncio.gather(*slow_clients), *(fast_worker() for _ in range(concurrency))
+    )
+    latencies = [latency for worker in results[1:] for latency in worker]
+
+    await dispose_engines()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"GET {path}: {slow} slow clients ({delay}s per message), {fast} fast requests")
+    print(f"fast p50: {percentiles[49]:.3f} ms")
+    print(f"fast p99: {percentiles[98]:.3f} ms")
+    print(f"peak checked out connections: {max(checked_out)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slow", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--fast", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.slow, args.delay, args.fast, args.concurrency))
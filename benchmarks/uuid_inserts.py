@@ -0,0 +1,65 @@
+"""
+Insert throughput and primary key index size for uuid4 versus uuid7 keys.
+
+    python -m benchmarks.uuid_inserts --rows 10000000
+
+Rows are written with COPY in batches into scratch tables shaped like `orders`,
+which are dropped afterwards. Key generation is excluded from the timings. Throughput is reported for the whole run and for the
+last batch, where random keys suffer most from B-tree page splits and cache misses.
+"""
+import argparse
+import asyncio
+import datetime
+import time
+from uuid import uuid4
+
+import asyncpg
+
+from app.db.keys import uuid7
+from app.db.session import ASYNC_URI
+
+
+async def run(connection: asyncpg.Connection, name: str, generate, rows: int, batch: int) -> None:
+    table = f"bench_orders_{name}"
+    await connection.execute(f"DROP TABLE IF EXISTS {table}")
+    await connection.execute(
+        f"CREATE TABLE {table} (order_id uuid PRIMARY KEY, order_date date, order_status varchar(20))"
+    )
+
+    today = datetime.date.today()
+    elapsed = 0.0
+    last_batch = 0.0
+
+    for offset in range(0, rows, batch):
+        # keys are generated up front, so only the database side is timed
+        records = [(generate(), today, "pending") for _ in range(min(batch, rows - offset))]
+        started = time.perf_counter()
+        await connection.copy_records_to_table(table, records=records)
+        last_batch = time.perf_counter() - started
+        elapsed += last_batch
+    index_size = await connection.fetchval(f"SELECT pg_relation_size('{table}_pkey')")
+    await connection.execute(f"DROP TABLE {table}")
+
+    print(
+        f"{name}: {rows / elapsed:,.0f} rows/s overall, "
+        f"{min(batch, rows) / last_batch:,.0f} rows/s last batch, "
+        f"pkey index {index_size / 2 ** 20:,.0f} MiB"
+    )
+
+
+async def main(rows: int, batch: int) -> None:
+    connection = await asyncpg.connect(ASYNC_URI.replace("postgresql+asyncpg", "postgresql", 1))
+    try:
+        await run(connection, "uuid4", uuid4, rows, batch)
+        await run(connection, "uuid7", uuid7, rows, batch)
+    finally:
+        await connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=100_000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.batch))
@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+
+set -eo pipefail
+
+# Sourced by the postgres image on first start: lets `db-replica` stream from this server
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,15 @@
+#!/usr/bin/env bash
+
+set -eo pipefail
+
+# Clone the primary into an empty data directory and start as a hot standby
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until PGPASSWORD="$POSTGRES_PASSWORD" pg_basebackup \
+        -h db -U "$POSTGRES_USER" -D "$PGDATA" --write-recovery-conf --wal-method=stream
+    do
+        sleep 1
+    done
+    chmod 700 "$PGDATA"
+fi
+
+exec postgres
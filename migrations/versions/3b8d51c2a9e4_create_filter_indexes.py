@@ -0,0 +1,55 @@
+"""create filter indexes
+
+Revision ID: 3b8d51c2a9e4
+Revises: 5f7cec578a08
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8d51c2a9e4'
+down_revision = '5f7cec578a08'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('customers', 'last_name'),
+    ('customers', 'email'),
+    ('shipments', 'shipment_date'),
+    ('shipments', 'shipment_status'),
+    ('orders', 'order_date'),
+    ('orders', 'order_status'),
+    ('laptops', 'manufacturer'),
+    ('laptops', 'make_year'),
+    ('components', 'type'),
+    ('components', 'make_year'),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY can not run inside a transaction
+    with op.get_context().autocommit_block():
+        for table, column in INDEXES:
+            op.create_index(
+                op.f(f'ix_{table}_{column}'),
+                table,
+                [column],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table, column in INDEXES:
+            op.drop_index(
+                op.f(f'ix_{table}_{column}'),
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,79 @@
+"""create foreign key and keyset indexes
+
+Revision ID: 8e2f07d4c1b6
+Revises: 3b8d51c2a9e4
+Create Date: 2026-10-18 10:04:17.552918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2f07d4c1b6'
+down_revision = '3b8d51c2a9e4'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, included columns)
+INDEXES = [
+    # foreign keys: relationship loaders and ON DELETE CASCADE lookups
+    ('ix_orders_customer_id', 'orders', ['customer_id'], None),
+    ('ix_orders_shipment_id', 'orders', ['shipment_id'], None),
+    ('ix_laptop_order_order_id', 'laptop_order', ['order_id'], None),
+    ('ix_laptop_order_laptop_id', 'laptop_order', ['laptop_id'], None),
+    ('ix_component_order_order_id', 'component_order', ['order_id'], None),
+    ('ix_component_order_component_id', 'component_order', ['component_id'], None),
+    ('ix_laptops_components_component_id', 'laptops_components', ['component_id'], None),
+    # keyset pagination over ORDER BY <column>, pk
+    ('ix_orders_order_date_order_id', 'orders', ['order_date', 'order_id'], None),
+    ('ix_orders_order_status_order_id', 'orders', ['order_status', 'order_id'], None),
+    ('ix_shipments_shipment_date_shipment_id', 'shipments', ['shipment_date', 'shipment_id'], None),
+    ('ix_shipments_shipment_status_shipment_id', 'shipments', ['shipment_status', 'shipment_id'], None),
+    # index only scans for the sparse fieldsets of the list endpoints
+    ('ix_orders_order_id_covering', 'orders', ['order_id'], ['order_status']),
+    ('ix_laptops_laptop_id_covering', 'laptops', ['laptop_id'], ['manufacturer', 'model']),
+]
+
+# single column indexes superseded by the keyset variants above
+SUPERSEDED = [
+    ('ix_orders_order_date', 'orders', ['order_date']),
+    ('ix_orders_order_status', 'orders', ['order_status']),
+    ('ix_shipments_shipment_date', 'shipments', ['shipment_date']),
+    ('ix_shipments_shipment_status', 'shipments', ['shipment_status']),
+]
+
+
+def upgrade():
+    # CREATE/DROP INDEX CONCURRENTLY can not run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, include in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_include=include or [],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        for name, table, columns in SUPERSEDED:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in SUPERSEDED:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        for name, table, columns, include in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
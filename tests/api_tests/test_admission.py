@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from app.base.admission import AdmissionControlMiddleware, ConcurrencyLimiter
+from app.base.dependencies.db import route_workload
+
+
+def make_client(release: asyncio.Event, **limits) -> AsyncClient:
+    async def slow_app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    options = dict(
+        limits={"read": 1, "write": 1}, queue_size=1, queue_timeout=5, retry_after=2,
+        exempt_paths={"/api/healthcheck"},
+    )
+    options.update(limits)
+    app = AdmissionControlMiddleware(slow_app, **options)
+    return AsyncClient(app=app, base_url="http://test")
+
+
+# saturated route class is rejected right away, once its queue is full
+@pytest.mark.asyncio
+async def test_admission_rejects_when_queue_is_full():
+    release = asyncio.Event()
+
+    async with make_client(release) as client:
+        in_flight = asyncio.create_task(client.get("/api/orders"))
+        queued = asyncio.create_task(client.get("/api/orders"))
+        await asyncio.sleep(0.05)
+
+        rejected = await client.get("/api/orders")
+        # other route classes and exempt paths are not affected
+        write = asyncio.create_task(client.post("/api/orders"))
+        healthcheck = asyncio.create_task(client.get("/api/healthcheck"))
+
+        release.set()
+        responses = await asyncio.gather(in_flight, queued, write, healthcheck)
+
+    assert rejected.status_code == 503
+    assert rejected.headers["retry-after"] == "2"
+    assert rejected.json() == {"status": 503, "message": "Service is overloaded, please retry later."}
+    assert [response.status_code for response in responses] == [200, 200, 200, 200]
+
+
+# queued request gives up after the queue timeout
+@pytest.mark.asyncio
+async def test_admission_rejects_after_queue_timeout():
+    release = asyncio.Event()
+
+    async with make_client(release, queue_timeout=0.05) as client:
+        in_flight = asyncio.create_task(client.get("/api/orders"))
+        await asyncio.sleep(0.01)
+
+        timed_out = await client.get("/api/orders")
+
+        release.set()
+        await in_flight
+
+    assert timed_out.status_code == 503
+
+
+# a freed slot goes to the queued request, not to one arriving after it
+@pytest.mark.asyncio
+async def test_limiter_serves_queue_first():
+    limiter = ConcurrencyLimiter(1, queue_size=2, queue_timeout=1)
+    assert await limiter.acquire()
+
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    limiter.release()
+    late = asyncio.create_task(limiter.acquire())
+
+    assert await queued
+    await asyncio.sleep(0.01)
+    assert not late.done()
+
+    limiter.release()
+    assert await late
+
+
+# requests are limited by the pool their route takes its session from
+@pytest.mark.parametrize(
+    "method, path, workload",
+    [
+        ("GET", "/api/laptops", "read"),
+        ("GET", "/api/customers/orders", "bulk"),
+        ("PATCH", "/api/shipments", "write"),
+        ("GET", "/api/unknown", None),
+    ],
+)
+def test_route_workload(init_app, method, path, workload):
+    scope = {"type": "http", "method": method, "path": path, "root_path": "", "app": init_app}
+
+    assert route_workload(scope) == workload
@@ -18,6 +18,34 @@ async def test_get_components(db_session, app_client):
     assert len(data["data"]) == 7
 
 
+# READ - filtered by type and make year
+@pytest.mark.asyncio
+async def test_get_components_filtered(db_session, app_client):
+    ComponentsFactory.create_batch(3, type="GPU", make_year=2021)
+    ComponentsFactory.create_batch(2, type="GPU", make_year=2023)
+    ComponentsFactory.create_batch(4, type="CPU", make_year=2023)
+    await db_session.commit()
+
+    result = await app_client.get("/api/components?make_year[gte]=2022&type=GPU")
+    data = result.json()
+
+    assert data["status"] == 200
+    assert len(data["data"]) == 2
+
+    result = await app_client.get("/api/components?type[in]=GPU,CPU&make_year[lt]=2022")
+    data = result.json()
+
+    assert len(data["data"]) == 3
+
+
+# READ - filter with an unknown operator
+@pytest.mark.asyncio
+async def test_get_components_filter_invalid_operator(db_session, app_client):
+    result = await app_client.get("/api/components?make_year[like]=2022")
+
+    assert result.status_code == 400
+
+
 # READ - specific
 @pytest.mark.asyncio
 async def test_get_component(db_session, app_client):
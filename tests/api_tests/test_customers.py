@@ -1,4 +1,10 @@
+from uuid import uuid4
 import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.db.models.customers import CustomersTable
+from app.modules.orders.schemas import CustomerOrdersData, CustomersOrdersResponse
+from app.modules.servicer import select_all_extended
 from tests.factories.customers import CustomersFactory
 from tests.factories.orders import OrdersFactory
 
@@ -17,6 +23,46 @@ async def test_get_customers(db_session, app_client):
     assert len(data["data"]) == 7
 
 
+# READ - paginated, customers without an email are neither skipped nor sortable
+@pytest.mark.asyncio
+async def test_get_customers_null_emails(db_session, app_client):
+    customers = [*CustomersFactory.create_batch(3), *CustomersFactory.create_batch(3, email=None)]
+    await db_session.commit()
+
+    result = await app_client.get("/api/customers?sort=email&limit=2")
+    assert result.status_code == 400
+
+    customer_ids, after = [], ""
+    while True:
+        data = (await app_client.get(f"/api/customers?limit=2{after}")).json()
+        customer_ids += [element["customer_id"] for element in data["data"]]
+        if data["next_cursor"] is None:
+            break
+        after = f"&after={data['next_cursor']}"
+
+    assert sorted(customer_ids) == sorted(str(customer.customer_id) for customer in customers)
+
+
+# READ - batch by ids with an expanded relationship
+@pytest.mark.asyncio
+async def test_get_customers_by_ids(db_session, app_client):
+    order = OrdersFactory()
+    customer = CustomersFactory()
+    await db_session.commit()
+
+    result = await app_client.get(
+        f"/api/customers?ids={customer.customer_id},{order.customer_id}&expand=orders"
+    )
+    data = result.json()
+
+    assert [element["customer_id"] for element in data["data"]] == [
+        str(customer.customer_id),
+        str(order.customer_id),
+    ]
+    assert [len(element["orders"]) for element in data["data"]] == [0, 1]
+    assert data["missing_ids"] == []
+
+
 # READ - specific
 @pytest.mark.asyncio
 async def test_get_customer(db_session, app_client):
@@ -47,6 +93,33 @@ async def test_get_customers_orders(db_session, app_client):
         assert len(element['orders']) == 1
 
 
+# READ customers' orders, rendered by Postgres exactly as the pydantic models would
+@pytest.mark.asyncio
+async def test_get_customers_orders_matches_orm_rendering(db_session, app_client):
+    customer = CustomersFactory(first_name='Zoë "Z"', email=None)
+    OrdersFactory.create_batch(3, customer=customer)
+    OrdersFactory(set_shipment=False)
+    CustomersFactory()
+    await db_session.commit()
+
+    customers = await select_all_extended(db_session, CustomersTable, "orders")
+    expected = CustomersOrdersResponse(
+        status=200,
+        message="Customers sucessfully retrieved",
+        data=[
+            {
+                **CustomerOrdersData.from_orm(customer).dict(),
+                "orders": sorted(customer.orders, key=lambda order: order.order_id),
+            }
+            for customer in sorted(customers, key=lambda customer: customer.customer_id)
+        ],
+    )
+
+    result = await app_client.get("/api/customers/orders")
+
+    assert result.content == JSONResponse(jsonable_encoder(expected)).body
+
+
 # READ - specific customer's orders
 @pytest.mark.asyncio
 async def test_get_customer_orders(db_session, app_client):
@@ -523,3 +596,27 @@ async def test_delete_customer(db_session, app_client):
 
     assert data["status"] == 200
     assert data["message"] == "Customer deleted successfully"
+
+
+# DELETE - customer's orders are removed by the database cascade
+@pytest.mark.asyncio
+async def test_delete_customer_with_orders(db_session, app_client):
+    customer = CustomersFactory()
+    orders = OrdersFactory.create_batch(3, customer=customer)
+    await db_session.commit()
+
+    result = await app_client.delete(f"/api/customers/{customer.customer_id}")
+    data = result.json()
+
+    assert data["status"] == 200
+    for order in orders:
+        result = await app_client.get(f"/api/orders/{order.order_id}")
+        assert result.status_code == 404
+
+
+# DELETE - non existent customer
+@pytest.mark.asyncio
+async def test_delete_customer_not_found(db_session, app_client):
+    result = await app_client.delete(f"/api/customers/{uuid4()}")
+
+    assert result.status_code == 404
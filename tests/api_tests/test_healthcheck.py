@@ -0,0 +1,35 @@
+import pytest
+
+
+# READ - healthcheck reports the connection pool
+@pytest.mark.asyncio
+async def test_healthcheck(db_session, app_client):
+    result = await app_client.get("/api/healthcheck")
+    data = result.json()
+
+    assert data["is_database_working"] is True
+    assert data["output"] == "ok"
+    assert set(data["pools"]) == {"critical", "read", "write", "bulk"}
+    assert data["pools"]["critical"]["checked_out"] == 1  # the healthcheck's own connection
+    assert data["pools"]["critical"]["checkouts"] >= 1
+    assert data["pools"]["read"]["checked_out"] == 0
+
+
+# READ - pool metrics
+@pytest.mark.asyncio
+async def test_metrics(db_session, app_client):
+    await app_client.get("/api/healthcheck")
+
+    result = await app_client.get("/api/metrics")
+    metrics = dict(
+        line.rsplit(" ", 1) for line in result.text.splitlines() if not line.startswith("#")
+    )
+
+    assert result.headers["content-type"].startswith("text/plain")
+    assert metrics['db_pool_checked_out{pool="critical"}'] == "0"
+    assert int(metrics['db_pool_wait_seconds_count{pool="critical"}']) >= 1
+    assert (
+        metrics['db_pool_wait_seconds_bucket{pool="critical",le="+Inf"}']
+        == metrics['db_pool_wait_seconds_count{pool="critical"}']
+    )
+    assert 'db_pool_pre_ping_failures_total{pool="bulk"}' in metrics
@@ -1,3 +1,4 @@
+import json
 import pytest
 from tests.factories.laptops import LaptopsFactory
 from tests.factories.components import ComponentsFactory
@@ -18,6 +19,57 @@ async def test_get_laptops(db_session, app_client):
     assert len(data["data"]) == 7
 
 
+# READ - sparse fieldset
+@pytest.mark.asyncio
+async def test_get_laptops_fields(db_session, app_client):
+    LaptopsFactory.create_batch(3)
+    await db_session.commit()
+
+    result = await app_client.get("/api/laptops?fields=manufacturer,model")
+    data = result.json()
+
+    assert data["status"] == 200
+    assert len(data["data"]) == 3
+    for element in data["data"]:
+        assert set(element) == {"laptop_id", "manufacturer", "model"}
+
+
+# READ - sparse fieldset with an unknown column
+@pytest.mark.asyncio
+async def test_get_laptops_fields_invalid(db_session, app_client):
+    result = await app_client.get("/api/laptops?fields=price")
+
+    assert result.status_code == 400
+
+
+# READ - batch by ids, in the requested order
+@pytest.mark.asyncio
+async def test_get_laptops_by_ids(db_session, app_client):
+    first, second, _ = LaptopsFactory.create_batch(3)
+    await db_session.commit()
+    unknown = "0190e0e4-0000-7000-8000-000000000000"
+
+    result = await app_client.get(
+        f"/api/laptops?ids={second.laptop_id},{unknown},{first.laptop_id}&fields=model"
+    )
+    data = result.json()
+
+    assert data["status"] == 200
+    assert [element["laptop_id"] for element in data["data"]] == [
+        str(second.laptop_id),
+        str(first.laptop_id),
+    ]
+    assert data["missing_ids"] == [unknown]
+
+
+# READ - batch by ids with a malformed id
+@pytest.mark.asyncio
+async def test_get_laptops_by_ids_invalid(db_session, app_client):
+    result = await app_client.get("/api/laptops?ids=not-a-uuid")
+
+    assert result.status_code == 400
+
+
 # READ - specific
 @pytest.mark.asyncio
 async def test_get_laptop(db_session, app_client):
@@ -72,6 +124,35 @@ async def test_create_laptop(db_session, app_client):
 
     assert data["status"] == 201
     assert data["message"] == "Laptop created successfully"
+    assert "next_cursor" not in data
+    assert "missing_ids" not in data
+
+
+# CREATE - many, from an NDJSON body
+@pytest.mark.asyncio
+async def test_create_laptops_bulk_ndjson(db_session, app_client):
+    rows = [{"manufacturer": "Dell", "model": f"XPS {i}", "make_year": 2023} for i in range(3)]
+
+    result = await app_client.post(
+        url="/api/laptops/bulk",
+        content="\n".join(json.dumps(row) for row in rows),
+        headers={"content-type": "application/x-ndjson"}
+    )
+    data = result.json()
+
+    assert data["status"] == 201
+    assert data["errors"] == []
+
+    result = await app_client.get(f"/api/laptops?ids={','.join(data['data'])}")
+    assert [laptop["model"] for laptop in result.json()["data"]] == ["XPS 0", "XPS 1", "XPS 2"]
+
+
+# CREATE - many, with a body that is not an array
+@pytest.mark.asyncio
+async def test_create_laptops_bulk_not_array(db_session, app_client):
+    result = await app_client.post(url="/api/laptops/bulk", json={"manufacturer": "Dell"})
+
+    assert result.status_code == 400
 
 
 # CREATE - add component to laptop
@@ -94,6 +175,12 @@ async def test_create_laptop_append_component(db_session, app_client):
     assert "components" in data['data']
     assert len(data['data']["components"]) >= 1
 
+    # committed before the response was sent
+    result = await app_client.get(f"/api/laptops/{laptop.laptop_id}/components")
+    assert [c["component_id"] for c in result.json()["data"]["components"]] == [
+        str(component.component_id)
+    ]
+
 
 # CREATE - invalid param values for laptop
 @pytest.mark.asyncio
@@ -1,4 +1,40 @@
+import json
+from datetime import date
+from uuid import UUID
 import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    Enum as SqlEnum,
+    Float,
+    Integer,
+    Row,
+    Uuid,
+    delete,
+    literal_column,
+    select
+)
+from sqlalchemy.exc import DBAPIError
+from app.db.models.customers import CustomersTable
+from app.db.models.orders import OrdersTable
+from app.modules.orders.schemas import (
+    OrderDocumentData,
+    OrderDocumentResponse,
+    OrderLaptopsData,
+    OrdersLaptopsResponse,
+    Status
+)
+from app.modules.servicer import (
+    _decode_cursor,
+    _encode_cursor,
+    _missing_references,
+    select_all_extended,
+    select_page
+)
+from app.db.session import engines, read_only_session_factory, session_factory, Workload
 from tests.factories.component_order import ComponentOrderFactory
 from tests.factories.components import ComponentsFactory
 from tests.factories.customers import CustomersFactory
@@ -25,6 +61,120 @@ async def test_get_orders(db_session, app_client):
         assert element["shipment_id"] is not None
 
 
+# READ - all orders, keyset pagination
+@pytest.mark.asyncio
+async def test_get_orders_paginated(db_session, app_client):
+    orders = OrdersFactory.create_batch(7)
+    await db_session.commit()
+
+    retrieved = []
+    pages = 0
+    url = "/api/orders?limit=3"
+    while url:
+        result = await app_client.get(url)
+        data = result.json()
+
+        assert data["status"] == 200
+        assert len(data["data"]) <= 3
+        retrieved.extend(element["order_id"] for element in data["data"])
+        pages += 1
+
+        cursor = data["next_cursor"]
+        url = f"/api/orders?limit=3&after={cursor}" if cursor else None
+
+    assert pages == 3
+    assert retrieved == sorted(str(order.order_id) for order in orders)
+
+
+# READ - all orders, streamed as NDJSON
+@pytest.mark.asyncio
+async def test_get_orders_stream(db_session, app_client):
+    OrdersFactory.create_batch(7)
+    await db_session.commit()
+
+    result = await app_client.get("/api/orders?stream=1")
+    lines = [json.loads(line) for line in result.text.splitlines()]
+
+    assert result.status_code == 200
+    assert len(lines) == 7
+    for element in lines:
+        assert element["customer_id"] is not None
+
+
+# READ - all orders, sparse fieldset across pages
+@pytest.mark.asyncio
+async def test_get_orders_fields_paginated(db_session, app_client):
+    OrdersFactory.create_batch(3)
+    await db_session.commit()
+
+    result = await app_client.get("/api/orders?fields=order_status&limit=2")
+    data = result.json()
+
+    assert data["next_cursor"] is not None
+    for element in data["data"]:
+        assert set(element) == {"order_id", "order_status"}
+
+    result = await app_client.get(f"/api/orders?fields=order_status&after={data['next_cursor']}")
+    data = result.json()
+
+    assert len(data["data"]) == 1
+    assert data["next_cursor"] is None
+
+
+# READ - all orders, filtered and sorted
+@pytest.mark.asyncio
+async def test_get_orders_filtered_sorted(db_session, app_client):
+    orders = OrdersFactory.create_batch(9)
+    await db_session.commit()
+
+    result = await app_client.get(
+        "/api/orders?order_status=pending&order_date[gte]=2023-11-02&sort=-order_date"
+    )
+    data = result.json()
+
+    expected = [
+        order for order in orders
+        if order.order_status == "pending" and order.order_date.date() >= date(2023, 11, 2)
+    ]
+    dates = [element["order_date"] for element in data["data"]]
+
+    assert data["status"] == 200
+    assert len(data["data"]) == len(expected)
+    assert all(element["order_status"] == "pending" for element in data["data"])
+    assert dates == sorted(dates, reverse=True)
+
+
+# READ - all orders, filter on a column without index
+@pytest.mark.asyncio
+async def test_get_orders_filter_not_indexed(db_session, app_client):
+    result = await app_client.get("/api/orders?shipment_address=Rome")
+
+    assert result.status_code == 400
+
+
+# READ - all orders, malformed cursor
+@pytest.mark.asyncio
+async def test_get_orders_invalid_cursor(db_session, app_client):
+    result = await app_client.get("/api/orders?after=not-a-cursor")
+
+    assert result.status_code == 400
+
+
+# READ - cursor values come back as the type of their sort column
+def test_cursor_round_trips_column_types():
+    columns = (
+        Column("status", SqlEnum(Status)),
+        Column("count", Integer),
+        Column("ratio", Float),
+        Column("active", Boolean),
+        Column("day", Date),
+        Column("id", Uuid),
+    )
+    values = (Status.shipped, 3, 0.1, False, date(2023, 11, 2), UUID(int=7))
+
+    assert _decode_cursor(_encode_cursor("count", values), "count", columns) == values
+
+
 # READ - specific, with shipment
 @pytest.mark.asyncio
 async def test_get_order(db_session, app_client):
@@ -57,6 +207,68 @@ async def test_get_order_without_shipment(db_session, app_client):
     assert data['data']["shipment_id"] is None
 
 
+# READ - GET routes run in a read-only transaction
+@pytest.mark.asyncio
+async def test_read_only_session_rejects_writes(db_session):
+    order = OrdersFactory()
+    await db_session.commit()
+
+    with pytest.raises(DBAPIError, match="read-only transaction"):
+        async with read_only_session_factory() as session:
+            await session.execute(delete(OrdersTable).where(OrdersTable.order_id == order.order_id))
+
+    assert await db_session.get(OrdersTable, order.order_id) is not None
+
+
+# READ - list reads without ?expand= return plain rows, nothing enters the identity map
+@pytest.mark.asyncio
+async def test_select_page_returns_core_rows(db_session):
+    OrdersFactory.create_batch(3)
+    await db_session.commit()
+
+    async with read_only_session_factory() as session:
+        orders, _ = await select_page(session, OrdersTable, fields=["order_status"])
+        assert all(isinstance(order, Row) for order in orders)
+        assert orders[0]._fields == ("order_id", "order_status")
+        assert len(session.identity_map) == 0
+
+        orders, _ = await select_page(session, OrdersTable, expand=["customer"])
+        assert all(isinstance(order, OrdersTable) for order in orders)
+
+
+# READ - connection is back in the pool before a slow client reads the body
+@pytest.mark.asyncio
+async def test_get_order_releases_connection_before_send(db_session, init_app):
+    order = OrdersFactory()
+    await db_session.commit()
+
+    checked_out = []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": f"/api/orders/{order.order_id}",
+        "raw_path": f"/api/orders/{order.order_id}".encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test")],
+        "server": ("test", 80),
+        "client": ("slow-client", 1234),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        checked_out.append(engines[Workload.READ].pool.checkedout())
+
+    await init_app(scope, receive, send)
+
+    assert checked_out == [0, 0]
+
+
 # READ - orders' customers
 @pytest.mark.asyncio
 async def test_get_orders_customers(db_session, app_client):
@@ -73,6 +285,108 @@ async def test_get_orders_customers(db_session, app_client):
         assert "customer" in element
 
 
+# READ - specific order, with expanded relationships
+@pytest.mark.asyncio
+async def test_get_order_expanded(db_session, app_client):
+    order = OrdersFactory()
+    laptop = LaptopsFactory()
+    component = ComponentsFactory()
+    await db_session.commit()
+
+    LaptopOrderFactory(order_id=order.order_id, laptop_id=laptop.laptop_id)
+    ComponentOrderFactory(order_id=order.order_id, component_id=component.component_id)
+    await db_session.commit()
+
+    result = await app_client.get(
+        f"/api/orders/{order.order_id}?expand=customer,shipment,laptops,components"
+    )
+    data = result.json()
+
+    assert data["status"] == 200
+    assert data["data"]["customer"]["customer_id"] == str(order.customer_id)
+    assert data["data"]["shipment"]["shipment_id"] == str(order.shipment_id)
+    assert [laptop["laptop_id"] for laptop in data["data"]["laptops"]] == [str(laptop.laptop_id)]
+    assert len(data["data"]["components"]) == 1
+
+
+# READ - all orders, relationships are only embedded when expanded
+@pytest.mark.asyncio
+async def test_get_orders_expanded(db_session, app_client):
+    OrdersFactory.create_batch(3)
+    await db_session.commit()
+
+    result = await app_client.get("/api/orders?expand=customer")
+    data = result.json()
+
+    assert data["status"] == 200
+    assert len(data["data"]) == 3
+    for element in data["data"]:
+        assert element["customer"]["customer_id"] == element["customer_id"]
+        assert "shipment" not in element
+        assert "laptops" not in element
+
+
+# READ - specific order, unknown relationship
+@pytest.mark.asyncio
+async def test_get_order_expand_invalid(db_session, app_client):
+    order = OrdersFactory()
+    await db_session.commit()
+
+    result = await app_client.get(f"/api/orders/{order.order_id}?expand=invoices")
+
+    assert result.status_code == 400
+
+
+# READ - specific order as one document built by Postgres
+@pytest.mark.asyncio
+async def test_get_order_full(db_session, app_client):
+    order = OrdersFactory()
+    laptop = LaptopsFactory()
+    component = ComponentsFactory()
+    await db_session.commit()
+
+    LaptopOrderFactory(order_id=order.order_id, laptop_id=laptop.laptop_id, quantity=3)
+    ComponentOrderFactory(order_id=order.order_id, component_id=component.component_id, quantity=2)
+    await db_session.commit()
+
+    result = await app_client.get(f"/api/orders/{order.order_id}/full")
+    data = result.json()
+
+    assert data["status"] == 200
+    assert data["message"] == "Order sucessfully retrieved"
+    document = OrderDocumentData.parse_obj(data["data"])
+    assert document.order_id == order.order_id
+    assert document.customer.customer_id == order.customer_id
+    assert document.shipment.shipment_id == order.shipment_id
+    assert [(line.laptop_id, line.quantity) for line in document.laptops] == [(laptop.laptop_id, 3)]
+    assert [(line.component_id, line.quantity) for line in document.components] == [
+        (component.component_id, 2)
+    ]
+    # compact, in field order, like every other endpoint
+    assert result.content == JSONResponse(jsonable_encoder(OrderDocumentResponse(**data))).body
+
+
+# READ - order document without shipment and line items
+@pytest.mark.asyncio
+async def test_get_order_full_empty(db_session, app_client):
+    order = OrdersFactory(set_shipment=False)
+    await db_session.commit()
+
+    result = await app_client.get(f"/api/orders/{order.order_id}/full")
+    data = result.json()["data"]
+
+    assert data["shipment"] is None
+    assert data["laptops"] == [] and data["components"] == []
+
+
+# READ - order document of an unknown order
+@pytest.mark.asyncio
+async def test_get_order_full_not_found(db_session, app_client):
+    result = await app_client.get("/api/orders/0190e0e4-0000-7000-8000-000000000000/full")
+
+    assert result.status_code == 404
+
+
 # READ - specific order's customer
 @pytest.mark.asyncio
 async def test_get_order_customer(db_session, app_client):
@@ -146,6 +460,62 @@ async def test_get_orders_laptops(db_session, app_client):
         assert len(element['laptops']) == 2
 
 
+# READ - orders' laptops, rendered by Postgres exactly as the pydantic models would
+@pytest.mark.asyncio
+async def test_get_orders_laptops_matches_orm_rendering(db_session, app_client):
+    order, _ = OrdersFactory.create_batch(2)
+    laptops = LaptopsFactory.create_batch(3)
+    await db_session.commit()
+
+    for laptop in laptops:
+        LaptopOrderFactory(order_id=order.order_id, laptop_id=laptop.laptop_id)
+    await db_session.commit()
+
+    orders = await select_all_extended(db_session, OrdersTable, "laptops")
+    expected = OrdersLaptopsResponse(
+        status=200,
+        message="Orders sucessfully retrieved",
+        data=[
+            {
+                **OrderLaptopsData.from_orm(order).dict(),
+                "laptops": sorted(order.laptops, key=lambda laptop: laptop.laptop_id),
+            }
+            for order in sorted(orders, key=lambda order: order.order_id)
+        ],
+    )
+
+    result = await app_client.get("/api/orders/laptops")
+
+    assert result.content == JSONResponse(jsonable_encoder(expected)).body
+
+
+# READ - orders' laptops, streamed as NDJSON
+@pytest.mark.asyncio
+async def test_get_orders_laptops_stream(db_session, app_client):
+    orders = OrdersFactory.create_batch(5)
+    laptops = LaptopsFactory.create_batch(5)
+    await db_session.commit()
+
+    for order, laptop in zip(orders, laptops):
+        LaptopOrderFactory(
+            order_id=order.order_id,
+            laptop_id=laptop.laptop_id
+        )
+    await db_session.commit()
+
+    result = await app_client.get(
+        "/api/orders/laptops",
+        headers={"Accept": "application/x-ndjson"}
+    )
+    lines = [json.loads(line) for line in result.text.splitlines()]
+
+    assert result.status_code == 200
+    assert result.headers["content-type"] == "application/x-ndjson"
+    assert len(lines) == 5
+    for element in lines:
+        assert len(element["laptops"]) == 1
+
+
 # READ - specific order's laptop
 @pytest.mark.asyncio
 async def test_get_order_laptops(db_session, app_client):
@@ -246,6 +616,57 @@ async def test_create_order(db_session, app_client):
     assert data["message"] == "Order created successfully"
 
 
+# CREATE - many, rejected rows are reported and do not fail the batch
+@pytest.mark.asyncio
+async def test_create_orders_bulk(db_session, app_client):
+    customer = CustomersFactory()
+    await db_session.commit()
+    unknown = "0190e0e4-0000-7000-8000-000000000000"
+
+    result = await app_client.post(
+        url="/api/orders/bulk",
+        json=[
+            {"customer_id": f"{customer.customer_id}", "order_date": "2023-11-20", "order_status": "pending"},
+            {"customer_id": f"{customer.customer_id}", "order_date": "wrong date", "order_status": "pending"},
+            {"customer_id": unknown, "order_date": "2023-11-20", "order_status": "pending"},
+            {"customer_id": f"{customer.customer_id}", "order_date": "2023-11-21", "order_status": "in progress"},
+        ]
+    )
+    data = result.json()
+
+    assert data["status"] == 201
+    assert data["data"][1] is None and data["data"][2] is None
+    assert [error["index"] for error in data["errors"]] == [1, 2]
+    assert data["errors"][0]["errors"][0]["loc"] == ["order_date"]
+    assert data["errors"][1]["errors"][0]["loc"] == ["customer_id"]
+
+    result = await app_client.get(f"/api/orders?ids={data['data'][0]},{data['data'][3]}")
+    orders = result.json()["data"]
+
+    assert [order["order_status"] for order in orders] == ["pending", "in progress"]
+    assert all(order["customer_id"] == str(customer.customer_id) for order in orders)
+
+
+# CREATE - many, referenced rows can not be deleted between the check and the COPY
+@pytest.mark.asyncio
+async def test_bulk_insert_locks_referenced_rows(db_session):
+    customer = CustomersFactory()
+    await db_session.commit()
+
+    async with session_factory() as session:
+        missing, _ = await _missing_references(
+            session, OrdersTable, {0: {"customer_id": customer.customer_id}}
+        )
+        assert missing == {}
+
+        async with engines[Workload.WRITE].connect() as connection:
+            await connection.exec_driver_sql("SET lock_timeout = '50ms'")
+            with pytest.raises(DBAPIError, match="lock timeout"):
+                await connection.execute(
+                    delete(CustomersTable).where(CustomersTable.customer_id == customer.customer_id)
+                )
+
+
 # CREATE - without shipment
 @pytest.mark.asyncio
 async def test_create_order_without_shipment(db_session, app_client):
@@ -266,6 +687,7 @@ async def test_create_order_without_shipment(db_session, app_client):
     assert data["status"] == 201
     assert data["message"] == "Order created successfully"
     assert data["data"]["shipment_id"] is None
+    assert UUID(data["data"]["order_id"]).version == 7
 
 
 # CREATE - wrong parameters formats
@@ -397,6 +819,64 @@ async def test_create_order_no_data(db_session, app_client):
     }
 
 
+# CREATE - checkout, order and line items at once
+@pytest.mark.asyncio
+async def test_checkout_order(db_session, app_client):
+    customer = CustomersFactory()
+    laptops = LaptopsFactory.create_batch(2)
+    component = ComponentsFactory()
+    await db_session.commit()
+
+    result = await app_client.post(
+        url="/api/orders/checkout",
+        json={
+            "customer_id": f"{customer.customer_id}",
+            "order_date": "2023-11-20",
+            "order_status": "pending",
+            "laptop_orders": [
+                {"laptop_id": f"{laptop.laptop_id}", "quantity": 2} for laptop in laptops
+            ],
+            "component_orders": [{"component_id": f"{component.component_id}", "quantity": 1}],
+        }
+    )
+    data = result.json()
+
+    assert data["status"] == 201
+    assert data["data"]["shipment_id"] is None
+    assert sorted(line["laptop_id"] for line in data["data"]["laptop_orders"]) == sorted(
+        str(laptop.laptop_id) for laptop in laptops
+    )
+    assert data["data"]["component_orders"][0]["order_id"] == data["data"]["order_id"]
+
+    order_id = data["data"]["order_id"]
+    result = await app_client.get(f"/api/orders/{order_id}?expand=laptops,components")
+    order = result.json()["data"]
+    assert len(order["laptops"]) == 2
+    assert len(order["components"]) == 1
+
+
+# CREATE - checkout with an unknown laptop leaves no order behind
+@pytest.mark.asyncio
+async def test_checkout_order_unknown_laptop(db_session, app_client):
+    customer = CustomersFactory()
+    await db_session.commit()
+
+    result = await app_client.post(
+        url="/api/orders/checkout",
+        json={
+            "customer_id": f"{customer.customer_id}",
+            "order_date": "2023-11-20",
+            "order_status": "pending",
+            "laptop_orders": [{"laptop_id": "0190e0e4-0000-7000-8000-000000000000", "quantity": 1}],
+        }
+    )
+
+    assert result.status_code == 404
+
+    result = await app_client.get(f"/api/orders?customer_id={customer.customer_id}")
+    assert result.json()["data"] == []
+
+
 # CREATE - add a laptop to order
 @pytest.mark.asyncio
 async def test_create_order_laptop(db_session, app_client):
@@ -690,6 +1170,49 @@ async def test_update_order(db_session, app_client):
     assert data["data"]["order_status"] == "finished"
 
 
+# UPDATE - many by ids
+@pytest.mark.asyncio
+async def test_update_orders_by_ids(db_session, app_client):
+    first, second, untouched = OrdersFactory.create_batch(3, order_status="pending")
+    await db_session.commit()
+
+    result = await app_client.patch(
+        url=f"/api/orders?ids={first.order_id},{second.order_id}",
+        json={"order_status": "finished"},
+    )
+    data = result.json()
+
+    assert data["status"] == 200
+    assert sorted(order["order_id"] for order in data["data"]) == sorted(
+        [str(first.order_id), str(second.order_id)]
+    )
+    assert all(order["order_status"] == "finished" for order in data["data"])
+
+    result = await app_client.get(f"/api/orders/{untouched.order_id}")
+    assert result.json()["data"]["order_status"] == "pending"
+
+
+# UPDATE - many, orders already in the target status are returned but not rewritten
+@pytest.mark.asyncio
+async def test_update_orders_skips_unchanged(db_session, app_client):
+    pending = OrdersFactory(order_status="pending")
+    finished = OrdersFactory(order_status="finished")
+    await db_session.commit()
+
+    xmin = select(literal_column("xmin::text")).where(OrdersTable.order_id == finished.order_id)
+    before = await db_session.scalar(xmin)
+
+    result = await app_client.patch(
+        url=f"/api/orders?ids={pending.order_id},{finished.order_id}",
+        json={"order_status": "finished"},
+    )
+    data = result.json()
+
+    assert len(data["data"]) == 2
+    assert all(order["order_status"] == "finished" for order in data["data"])
+    assert await db_session.scalar(xmin) == before
+
+
 # UPDATE - customer_id/non-existent parameter
 @pytest.mark.asyncio
 async def test_update_order_customer_id(db_session, app_client):
@@ -1,3 +1,4 @@
+from uuid import uuid4
 import random
 import pytest
 from tests.factories.orders import OrdersFactory
@@ -238,6 +239,59 @@ async def test_update_shipment(db_session, app_client):
     assert data["data"]["shipment_address"] == "Rome"
 
 
+# UPDATE - many by filter, cascading the status to the shipments' orders
+@pytest.mark.asyncio
+async def test_update_shipments_by_status_cascades_to_orders(db_session, app_client):
+    pending = ShipmentsFactory(shipment_status="pending")
+    delivered = ShipmentsFactory(shipment_status="delivered")
+    order = OrdersFactory(order_status="pending", set_shipment=pending)
+    OrdersFactory(order_status="finished", set_shipment=delivered)
+    await db_session.commit()
+
+    result = await app_client.patch(
+        url="/api/shipments?shipment_status=pending",
+        json={"shipment_status": "shipped", "order_status": "in progress"},
+    )
+    data = result.json()
+
+    assert data["status"] == 200
+    assert [shipment["shipment_id"] for shipment in data["data"]] == [str(pending.shipment_id)]
+    assert data["data"][0]["shipment_status"] == "shipped"
+    assert data["orders_updated"] == [str(order.order_id)]
+
+    result = await app_client.get(f"/api/orders/{order.order_id}")
+    assert result.json()["data"]["order_status"] == "in progress"
+
+
+# UPDATE - many by ids, only the orders' status changes
+@pytest.mark.asyncio
+async def test_update_shipments_order_status_only(db_session, app_client):
+    shipment = ShipmentsFactory(shipment_status="pending")
+    order = OrdersFactory(order_status="pending", set_shipment=shipment)
+    await db_session.commit()
+
+    result = await app_client.patch(
+        url=f"/api/shipments?ids={shipment.shipment_id}",
+        json={"order_status": "finished"},
+    )
+    data = result.json()
+
+    assert data["status"] == 200
+    assert data["data"][0]["shipment_status"] == "pending"
+    assert data["orders_updated"] == [str(order.order_id)]
+
+    result = await app_client.get(f"/api/orders/{order.order_id}")
+    assert result.json()["data"]["order_status"] == "finished"
+
+
+# UPDATE - many without selecting any shipment
+@pytest.mark.asyncio
+async def test_update_shipments_without_selection(db_session, app_client):
+    result = await app_client.patch(url="/api/shipments", json={"shipment_status": "shipped"})
+
+    assert result.status_code == 400
+
+
 # UPDATE - non existent/updateable parameter
 @pytest.mark.asyncio
 async def test_update_shipment_with_false_param(db_session, app_client):
@@ -254,6 +308,17 @@ async def test_update_shipment_with_false_param(db_session, app_client):
     assert data['message'] == "No data to update, please check your data."
 
 
+# UPDATE - non existent shipment
+@pytest.mark.asyncio
+async def test_update_shipment_not_found(db_session, app_client):
+    result = await app_client.patch(
+        url=f"/api/shipments/{uuid4()}",
+        json={"shipment_status": "delivered"},
+    )
+
+    assert result.status_code == 404
+
+
 # UPDATE - wrong param formats
 @pytest.mark.asyncio
 async def test_update_shipment_wrong_param_formats(db_session, app_client):